@@ -513,26 +513,7 @@ class TimeRangeParsingCapability(BaseCapability):
         logger.debug(f"Time parsing for task '{task_objective}': {task_objective}")
 
         try:
-            # Get model config from LangGraph configurable
-            model_config = get_model_config("time_parsing")
-
-            # Set caller context for API call logging (propagates through asyncio.to_thread)
-            from osprey.models import set_api_call_context
-
-            set_api_call_context(
-                function="execute",
-                module="time_range_parsing",
-                class_name="TimeRangeParsingCapability",
-                extra={"capability": "time_range_parsing"},
-            )
-
-            # LLM call with structured output
-            response_data = await asyncio.to_thread(
-                get_chat_completion,
-                model_config=model_config,
-                message=full_prompt,
-                output_model=TimeRangeOutput,
-            )
+            response_data = await self._call_llm(full_prompt)
 
         except Exception as e:
             logger.error(f"LLM call failed for time parsing: {e}")
@@ -597,6 +578,35 @@ class TimeRangeParsingCapability(BaseCapability):
         # Return state updates (LangGraph will merge automatically)
         return self.store_output_context(time_context)
 
+    async def _call_llm(self, prompt: str) -> Any:
+        """Run the structured time parsing LLM call off the event loop.
+
+        :param prompt: Complete time parsing prompt including the user query
+        :type prompt: str
+        :return: Structured response, expected to be a :class:`TimeRangeOutput`
+        :rtype: Any
+        """
+        # Get model config from LangGraph configurable
+        model_config = get_model_config("time_parsing")
+
+        # Set caller context for API call logging (propagates through to_thread)
+        from osprey.models import set_api_call_context
+
+        set_api_call_context(
+            function="execute",
+            module="time_range_parsing",
+            class_name="TimeRangeParsingCapability",
+            extra={"capability": "time_range_parsing"},
+        )
+
+        # LLM call with structured output
+        return await asyncio.to_thread(
+            get_chat_completion,
+            model_config=model_config,
+            message=prompt,
+            output_model=TimeRangeOutput,
+        )
+
     @staticmethod
     def classify_error(exc: Exception, context: dict) -> ErrorClassification:
         """Classify time parsing errors for sophisticated recovery strategies.
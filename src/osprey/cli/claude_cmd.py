@@ -31,21 +31,13 @@ from osprey.cli.styles import Styles, console
 DEFAULT_ALLOWED_TOOLS = ["Read", "Glob", "Grep", "Bash", "Edit"]
 
 
-def parse_task_frontmatter(task: str) -> dict[str, Any]:
-    """Parse YAML frontmatter from a task's instructions.md file.
-
-    Args:
-        task: Name of the task
-
-    Returns:
-        Dictionary of frontmatter fields, empty dict if no frontmatter
-    """
-    instructions_file = get_tasks_root() / task / "instructions.md"
-    if not instructions_file.exists():
-        return {}
+# Parsed frontmatter per file, with the (mtime_ns, size) it was parsed at; one entry
+# per task file, replaced when the file changes
+_FRONTMATTER_CACHE: dict[Path, tuple[tuple[int, int], dict[str, Any]]] = {}
 
-    content = instructions_file.read_text()
 
+def _parse_frontmatter_text(content: str) -> dict[str, Any]:
+    """Parse the YAML frontmatter block at the start of a markdown document."""
     # Check for frontmatter (starts with ---)
     if not content.startswith("---"):
         return {}
@@ -63,6 +55,32 @@ def parse_task_frontmatter(task: str) -> dict[str, Any]:
         return {}
 
 
+def parse_task_frontmatter(task: str) -> dict[str, Any]:
+    """Parse YAML frontmatter from a task's instructions.md file.
+
+    Results are cached per file and reused until the file's mtime or size changes.
+
+    Args:
+        task: Name of the task
+
+    Returns:
+        Dictionary of frontmatter fields, empty dict if no frontmatter
+    """
+    instructions_file = get_tasks_root() / task / "instructions.md"
+    try:
+        st = instructions_file.stat()
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = _FRONTMATTER_CACHE.get(instructions_file)
+        if cached is not None and cached[0] == stamp:
+            return dict(cached[1])
+        frontmatter = _parse_frontmatter_text(instructions_file.read_text())
+    except OSError:
+        return {}
+
+    _FRONTMATTER_CACHE[instructions_file] = (stamp, frontmatter)
+    return dict(frontmatter)
+
+
 def get_task_title(task: str) -> str:
     """Extract the title (first H1) from a task's instructions.md file.
 
@@ -178,9 +196,14 @@ def get_available_tasks() -> list[str]:
     )
 
 
+def _get_install_root() -> Path:
+    """Get the project root that skills are installed under."""
+    return Path.cwd()
+
+
 def get_claude_skills_dir() -> Path:
     """Get the Claude Code skills directory."""
-    return Path.cwd() / ".claude" / "skills"
+    return _get_install_root() / ".claude" / "skills"
 
 
 def get_installed_skills() -> list[str]:
@@ -269,12 +292,13 @@ def install_skill(task: str, force: bool):
         return
 
     # Destination directory
+    install_root = _get_install_root()
     dest_dir = get_claude_skills_dir() / task
 
     # Check if already installed
     if dest_dir.exists() and any(dest_dir.glob("*.md")) and not force:
         console.print(
-            f"[warning]⚠[/warning]  Skill already installed at: {dest_dir.relative_to(Path.cwd())}"
+            f"[warning]⚠[/warning]  Skill already installed at: {dest_dir.relative_to(install_root)}"
         )
         console.print("    Use [command]--force[/command] to overwrite")
         return
@@ -292,7 +316,7 @@ def install_skill(task: str, force: bool):
         for source_file in integration_dir.glob("*.md"):
             dest_file = dest_dir / source_file.name
             shutil.copy2(source_file, dest_file)
-            console.print(f"  [success]✓[/success] {dest_file.relative_to(Path.cwd())}")
+            console.print(f"  [success]✓[/success] {dest_file.relative_to(install_root)}")
             files_copied += 1
     else:
         # Auto-generate SKILL.md from frontmatter
@@ -301,7 +325,7 @@ def install_skill(task: str, force: bool):
         skill_file = dest_dir / "SKILL.md"
         skill_file.write_text(skill_content)
         console.print(
-            f"  [success]✓[/success] {skill_file.relative_to(Path.cwd())} [dim](generated)[/dim]"
+            f"  [success]✓[/success] {skill_file.relative_to(install_root)} [dim](generated)[/dim]"
         )
         files_copied += 1
 
@@ -310,7 +334,7 @@ def install_skill(task: str, force: bool):
     if instructions_source.exists():
         instructions_dest = dest_dir / "instructions.md"
         shutil.copy2(instructions_source, instructions_dest)
-        console.print(f"  [success]✓[/success] {instructions_dest.relative_to(Path.cwd())}")
+        console.print(f"  [success]✓[/success] {instructions_dest.relative_to(install_root)}")
         files_copied += 1
 
     # Copy any additional task files (e.g., migrate has versions/, schema.yml)
@@ -321,7 +345,7 @@ def install_skill(task: str, force: bool):
         if item.is_file():
             dest_file = dest_dir / item.name
             shutil.copy2(item, dest_file)
-            console.print(f"  [success]✓[/success] {dest_file.relative_to(Path.cwd())}")
+            console.print(f"  [success]✓[/success] {dest_file.relative_to(install_root)}")
             files_copied += 1
         elif item.is_dir():
             dest_subdir = dest_dir / item.name
@@ -329,7 +353,7 @@ def install_skill(task: str, force: bool):
                 shutil.rmtree(dest_subdir)
             shutil.copytree(item, dest_subdir)
             console.print(
-                f"  [success]✓[/success] {dest_subdir.relative_to(Path.cwd())}/ [dim](directory)[/dim]"
+                f"  [success]✓[/success] {dest_subdir.relative_to(install_root)}/ [dim](directory)[/dim]"
             )
             files_copied += 1
 
@@ -165,6 +165,11 @@ def get_project_atmention_path(task: str) -> str:
 # ============================================================================
 
 
+def _command_exists(cmd: str) -> bool:
+    """Check whether an executable is available on PATH."""
+    return shutil.which(cmd) is not None
+
+
 def detect_editor() -> tuple[str, str] | None:
     """Detect available editor.
 
@@ -181,17 +186,17 @@ def detect_editor() -> tuple[str, str] | None:
     ]
 
     for cmd, name in ide_commands:
-        if shutil.which(cmd):
+        if _command_exists(cmd):
             return (cmd, name)
 
     # Fall back to $EDITOR
     editor = os.environ.get("EDITOR")
-    if editor and shutil.which(editor):
+    if editor and _command_exists(editor):
         return (editor, editor)
 
     # Fall back to common terminal editors
     for cmd in ["nano", "vim", "vi"]:
-        if shutil.which(cmd):
+        if _command_exists(cmd):
             return (cmd, cmd)
 
     return None
@@ -6,6 +6,7 @@ common development tasks.
 """
 
 import shutil
+from functools import cache
 from pathlib import Path
 
 import click
@@ -13,6 +14,28 @@ import click
 from .styles import Messages, Styles, console
 
 
+@cache
+def _locate_tasks_dir() -> Path:
+    """Resolve the bundled assist/tasks directory once per process.
+
+    Errors propagate to the caller and are not cached.
+    """
+    # Python 3.11+ compatible way to access package resources
+    # This works for both installed packages and development mode
+    from importlib.resources import files
+
+    # Point to assist/tasks instead of deprecated workflows directory
+    tasks_ref = files("osprey").joinpath("assist", "tasks")
+
+    # Convert to Path - handle both Traversable and Path objects
+    if hasattr(tasks_ref, "__fspath__"):
+        # It's a real Path
+        return Path(tasks_ref)
+    else:
+        # It's a Traversable, convert via str
+        return Path(str(tasks_ref))
+
+
 def get_workflows_source_path() -> Path | None:
     """Get the path to bundled workflow files using importlib.resources.
 
@@ -24,20 +47,7 @@ def get_workflows_source_path() -> Path | None:
         or None if not found.
     """
     try:
-        # Python 3.11+ compatible way to access package resources
-        # This works for both installed packages and development mode
-        from importlib.resources import files
-
-        # Point to assist/tasks instead of deprecated workflows directory
-        tasks_ref = files("osprey").joinpath("assist", "tasks")
-
-        # Convert to Path - handle both Traversable and Path objects
-        if hasattr(tasks_ref, "__fspath__"):
-            # It's a real Path
-            return Path(tasks_ref)
-        else:
-            # It's a Traversable, convert via str
-            return Path(str(tasks_ref))
+        return _locate_tasks_dir()
     except Exception as e:
         console.print(f"{Messages.error('Error locating workflow files:')} {e}", style=Styles.ERROR)
         return None
@@ -36,6 +36,27 @@ class BaseDatabase(ABC):
         """
         pass
 
+    def get_channels(self, channel_names: list[str]) -> dict[str, dict]:
+        """
+        Get channel information for several names at once.
+
+        Subclasses backed by an in-memory index or a remote store should
+        override this with a single lookup pass or query.
+
+        Args:
+            channel_names: Channel names to lookup
+
+        Returns:
+            Dict mapping each found channel name to its channel dict
+            (names not in the database are omitted)
+        """
+        channels = {}
+        for channel_name in channel_names:
+            channel_data = self.get_channel(channel_name)
+            if channel_data is not None:
+                channels[channel_name] = channel_data
+        return channels
+
     @abstractmethod
     def get_all_channels(self) -> list[dict]:
         """
@@ -172,10 +172,11 @@ class BasePipeline(ABC):
         Returns:
             ChannelFinderResult with channel info
         """
+        channel_rows = self.database.get_channels(channels)
         channel_infos = []
 
         for channel_name in channels:
-            channel_data = self.database.get_channel(channel_name)
+            channel_data = channel_rows.get(channel_name)
             if channel_data:
                 channel_infos.append(
                     ChannelInfo(
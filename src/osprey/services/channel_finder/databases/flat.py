@@ -50,6 +50,15 @@ class ChannelDatabase(BaseDatabase):
         """Get channel by exact name match."""
         return self.channel_map.get(channel_name)
 
+    def get_channels(self, channel_names: list[str]) -> dict[str, dict]:
+        """Get several channels by exact name match in one pass over the index."""
+        channel_map = self.channel_map
+        return {
+            name: channel_data
+            for name in channel_names
+            if (channel_data := channel_map.get(name)) is not None
+        }
+
     def validate_channel(self, channel_name: str) -> bool:
         """Check if channel exists in database."""
         return channel_name in self.channel_map
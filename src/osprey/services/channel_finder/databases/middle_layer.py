@@ -37,10 +37,25 @@ Example structure:
 """
 
 import json
+from typing import TypedDict
 
 from ..core.base_database import BaseDatabase
 
 
+class HierarchyEntry(TypedDict):
+    """A system or family as returned by list_systems/list_families."""
+
+    name: str
+    description: str  # Empty string if not provided in database
+
+
+class FieldSpec(TypedDict):
+    """Structure of one field or subfield as returned by inspect_fields."""
+
+    type: str
+    description: str  # Empty string if not provided in database
+
+
 class MiddleLayerDatabase(BaseDatabase):
     """
     Database for middle-layer (MML) style channel organization.
@@ -66,6 +81,9 @@ class MiddleLayerDatabase(BaseDatabase):
         # Build flat channel map for validation and lookup
         self.channel_map = self._build_channel_map()
 
+        # Bumped on every (re)load so callers can invalidate derived caches
+        self.version = getattr(self, "version", 0) + 1
+
     def _build_channel_map(self) -> dict[str, dict]:
         """
         Flatten MML hierarchy into channel map for O(1) validation.
@@ -175,6 +193,23 @@ class MiddleLayerDatabase(BaseDatabase):
         """
         return self.channel_map.get(channel_name.strip())
 
+    def get_channels(self, channel_names: list[str]) -> dict[str, dict]:
+        """
+        Get channel information for several names in one pass over the index.
+
+        Args:
+            channel_names: Channel names to lookup
+
+        Returns:
+            Dict mapping each found channel name to its channel dict
+        """
+        channel_map = self.channel_map
+        return {
+            name: channel_data
+            for name in channel_names
+            if (channel_data := channel_map.get(name.strip())) is not None
+        }
+
     def get_all_channels(self) -> list[dict]:
         """
         Get all channels in the database.
@@ -224,7 +259,7 @@ class MiddleLayerDatabase(BaseDatabase):
 
     # === Tool support methods for React agent ===
 
-    def list_systems(self) -> list[dict[str, str]]:
+    def list_systems(self) -> list[HierarchyEntry]:
         """
         Get list of all system names with descriptions.
 
@@ -238,7 +273,7 @@ class MiddleLayerDatabase(BaseDatabase):
                 systems.append({"name": s, "description": self.data[s].get("_description", "")})
         return systems
 
-    def list_families(self, system: str) -> list[dict[str, str]]:
+    def list_families(self, system: str) -> list[HierarchyEntry]:
         """
         Get list of families in a system with descriptions.
 
@@ -268,7 +303,7 @@ class MiddleLayerDatabase(BaseDatabase):
 
     def inspect_fields(
         self, system: str, family: str, field: str | None = None
-    ) -> dict[str, dict[str, str]]:
+    ) -> dict[str, FieldSpec]:
         """
         Inspect field structure with types and descriptions.
 
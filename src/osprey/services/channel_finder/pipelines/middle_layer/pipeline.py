@@ -18,8 +18,12 @@ production at facilities like ALS, ESRF, and others.
 """
 
 import asyncio
+import json
 import logging
 import random
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -38,12 +42,26 @@ except ImportError as err:
         "LangGraph not installed. Install with: pip install langgraph langchain-core"
     ) from err
 
+# Optional fast JSON encoder for debug prompt records
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None  # type: ignore
+
 from ...core.base_pipeline import BasePipeline
 from ...core.models import ChannelFinderResult, ChannelInfo, QuerySplitterOutput
+from ...databases.middle_layer import FieldSpec, HierarchyEntry
 from ...utils.prompt_loader import load_prompts
 
 logger = logging.getLogger(__name__)
 
+# Bounds for the per-pipeline cache of query splits and agent results
+_QUERY_CACHE_MAXSIZE = 256
+_QUERY_CACHE_TTL_SECONDS = 600.0
+
 
 # === Structured Output Models ===
 
@@ -62,34 +80,57 @@ class ChannelSearchResult(BaseModel):
 # === Tool Support Functions ===
 
 
+# Debug prompt file names per pipeline stage (other stages use prompt_<stage>.txt)
+_STAGE_FILENAMES = {
+    "query_split": "prompt_stage1_query_split.txt",
+    "pv_query": "prompt_stage2_pv_query.txt",
+}
+
+
+def _write_prompt_file(
+    filepath: Path, prompt: str, stage: str, query: str, as_json: bool = False
+) -> None:
+    """Write a prompt to disk (blocking), as a header + text or as a JSON record."""
+    # Cheap when the directory exists, and recreates it if it was cleaned up
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().isoformat()
+    if as_json:
+        record = {"stage": stage, "timestamp": timestamp, "query": query, "prompt": prompt}
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(record)
+        else:
+            data = json.dumps(record, ensure_ascii=False).encode("utf-8")
+        filepath.write_bytes(data)
+        return
+
+    header = f"=== STAGE: {stage.upper()} ===\n=== TIMESTAMP: {timestamp} ===\n"
+    if query:
+        header += f"=== QUERY: {query} ===\n"
+    filepath.write_text(header + "=" * 80 + "\n\n" + prompt, encoding="utf-8")
+
+
 def _save_prompt_to_file(prompt: str, stage: str, query: str = "") -> None:
-    """Save prompt to temporary file for inspection."""
+    """Save prompt to temporary file for inspection (blocking).
+
+    Only saves if debug.save_prompts is enabled in config.yml. Async callers
+    run it through ``asyncio.to_thread``.
+    """
+    # get_config_builder() returns the process-wide singleton; fetch the debug
+    # section once instead of resolving several dotted paths
     config_builder = get_config_builder()
-    if not config_builder.get("debug.save_prompts", False):
+    debug_config = config_builder.raw_config.get("debug") or {}
+    if not debug_config.get("save_prompts", False):
         return
 
-    prompts_dir = config_builder.get("debug.prompts_dir", "temp_prompts")
-    project_root = Path(config_builder.get("project_root"))
-    temp_dir = project_root / prompts_dir
-    temp_dir.mkdir(exist_ok=True, parents=True)
-
-    # Map stage names
-    if stage == "query_split":
-        filename = "prompt_stage1_query_split.txt"
-    elif stage == "pv_query":
-        filename = "prompt_stage2_pv_query.txt"
-    else:
-        filename = f"prompt_{stage}.txt"
-
-    filepath = temp_dir / filename
-
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(f"=== STAGE: {stage.upper()} ===\n")
-        f.write(f"=== TIMESTAMP: {datetime.now().isoformat()} ===\n")
-        if query:
-            f.write(f"=== QUERY: {query} ===\n")
-        f.write("=" * 80 + "\n\n")
-        f.write(prompt)
+    temp_dir = Path(config_builder.raw_config.get("project_root")) / debug_config.get(
+        "prompts_dir", "temp_prompts"
+    )
+    filepath = temp_dir / _STAGE_FILENAMES.get(stage, f"prompt_{stage}.txt")
+    as_json = debug_config.get("prompts_format", "text") == "json"
+    if as_json:
+        filepath = filepath.with_suffix(".json")
+
+    _write_prompt_file(filepath, prompt, stage, query, as_json)
 
     logger.debug(f"  [dim]Saved prompt to: {filepath}[/dim]")
 
@@ -141,18 +182,94 @@ class MiddleLayerPipeline(BasePipeline):
         # Agent will be created lazily on first use
         self._agent = None
 
+        # The system prompt only depends on facility settings, so build it once
+        self._system_prompt = self._get_system_prompt()
+
+        # Results of read-only agent tools, keyed on (tool name, args); cleared
+        # whenever the database reports a new version (i.e. it was reloaded)
+        self._tool_cache: dict[tuple, Any] = {}
+        self._tool_cache_version: int | None = None
+
+        # LRU+TTL cache of query splits and agent results, keyed on normalized query;
+        # cleared like the tool cache when the database version changes
+        self._query_cache: OrderedDict[tuple[str, str, str], tuple[float, Any]] = OrderedDict()
+        self._query_cache_version: int | None = None
+
     @property
     def pipeline_name(self) -> str:
         """Return the pipeline name."""
         return "Middle Layer React Agent"
 
+    def clear_query_cache(self) -> None:
+        """Drop all cached query splits and agent results.
+
+        A database reload already invalidates them; this is for forcing fresh LLM calls.
+        """
+        self._query_cache.clear()
+
+    def _cached_tool_result(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        """Return the cached result for a tool call, computing it on first use.
+
+        Exceptions from ``compute`` propagate and are not cached.
+        """
+        version = getattr(self.database, "version", 0)
+        if version != self._tool_cache_version:
+            self._tool_cache.clear()
+            self._tool_cache_version = version
+        try:
+            return self._tool_cache[key]
+        except KeyError:
+            result = self._tool_cache[key] = compute()
+            return result
+
+    async def _cached_call(
+        self,
+        stage: str,
+        query: str,
+        func: Callable[[str], Awaitable[Any]],
+        use_cache: bool = True,
+    ) -> Any:
+        """Await ``func(query)``, reusing a recent result for the same normalized query.
+
+        Only non-empty results are cached, so transient agent failures are retried
+        on the next request instead of being replayed for the whole TTL.
+        """
+        if not use_cache:
+            return await func(query)
+
+        version = getattr(self.database, "version", 0)
+        if version != self._query_cache_version:
+            self._query_cache.clear()
+            self._query_cache_version = version
+
+        key = (stage, self.facility_name, " ".join(query.split()).lower())
+        entry = self._query_cache.get(key)
+        if entry is not None:
+            if time.monotonic() - entry[0] < _QUERY_CACHE_TTL_SECONDS:
+                self._query_cache.move_to_end(key)
+                logger.debug(f"  [dim]Cache hit for {stage}: {query}[/dim]")
+                return entry[1]
+            del self._query_cache[key]
+
+        result = await func(query)
+
+        cacheable = result.get("channels") if isinstance(result, dict) else result
+        if cacheable:
+            self._query_cache[key] = (time.monotonic(), result)
+            if len(self._query_cache) > _QUERY_CACHE_MAXSIZE:
+                self._query_cache.popitem(last=False)
+        return result
+
     def _create_tools(self) -> list:
         """Create LangChain tools for database queries."""
-        # Use the @tool decorator for each database operation
-        # We'll capture self.database in closures
+        # Use the @tool decorator for each database operation. The closures
+        # capture the database directly rather than the whole pipeline, so each
+        # tool call is a plain cell load instead of a self.database lookup.
+        database = self.database
+        cached = self._cached_tool_result
 
         @tool
-        def list_systems() -> list[dict[str, str]]:
+        def list_systems() -> list[HierarchyEntry]:
             """Get list of all available systems in the control system.
 
             Returns:
@@ -164,12 +281,12 @@ class MiddleLayerPipeline(BasePipeline):
                 ]
             """
             logger.info("Tool: list_systems() called")
-            result = self.database.list_systems()
-            logger.debug(f"  → Returned {len(result)} systems")
+            result = cached(("list_systems",), database.list_systems)
+            logger.debug("  → Returned %d systems", len(result))
             return result
 
         @tool
-        def list_families(system: str) -> list[dict[str, str]]:
+        def list_families(system: str) -> list[HierarchyEntry]:
             """Get list of device families in a specific system.
 
             Args:
@@ -183,10 +300,10 @@ class MiddleLayerPipeline(BasePipeline):
                     {'name': 'DCCT', 'description': ''}  # Empty string if no description
                 ]
             """
-            logger.info(f"Tool: list_families(system='{system}') called")
+            logger.info("Tool: list_families(system=%r) called", system)
             try:
-                result = self.database.list_families(system)
-                logger.debug(f"  → Returned {len(result)} families")
+                result = cached(("list_families", system), lambda: database.list_families(system))
+                logger.debug("  → Returned %d families", len(result))
                 return result
             except ValueError as e:
                 return {"error": str(e)}
@@ -194,7 +311,7 @@ class MiddleLayerPipeline(BasePipeline):
         @tool
         def inspect_fields(
             system: str, family: str, field: str = None
-        ) -> dict[str, dict[str, str]]:
+        ) -> dict[str, FieldSpec]:
             """Inspect the structure of fields within a family.
 
             Use this to discover what fields and subfields are available
@@ -223,11 +340,14 @@ class MiddleLayerPipeline(BasePipeline):
                 }
             """
             logger.info(
-                f"Tool: inspect_fields(system='{system}', family='{family}', field='{field}') called"
+                "Tool: inspect_fields(system=%r, family=%r, field=%r) called", system, family, field
             )
             try:
-                result = self.database.inspect_fields(system, family, field)
-                logger.debug(f"  → Returned {len(result)} fields")
+                result = cached(
+                    ("inspect_fields", system, family, field),
+                    lambda: database.inspect_fields(system, family, field),
+                )
+                logger.debug("  → Returned %d fields", len(result))
                 return result
             except ValueError as e:
                 return {"error": str(e)}
@@ -258,14 +378,27 @@ class MiddleLayerPipeline(BasePipeline):
                 List of PV addresses (e.g., ['SR01C:BPM1:X', 'SR01C:BPM2:X'])
             """
             logger.info(
-                f"Tool: list_channel_names(system='{system}', family='{family}', "
-                f"field='{field}', subfield='{subfield}', sectors={sectors}, devices={devices}) called"
+                "Tool: list_channel_names(system=%r, family=%r, field=%r, subfield=%r, "
+                "sectors=%s, devices=%s) called",
+                system,
+                family,
+                field,
+                subfield,
+                sectors,
+                devices,
             )
             try:
-                result = self.database.list_channel_names(
-                    system, family, field, subfield, sectors, devices
-                )
-                logger.debug(f"  → Returned {len(result)} channels")
+                if sectors is None and devices is None:
+                    # Unfiltered listings are the common case and have hashable args
+                    result = cached(
+                        ("list_channel_names", system, family, field, subfield),
+                        lambda: database.list_channel_names(system, family, field, subfield),
+                    )
+                else:
+                    result = database.list_channel_names(
+                        system, family, field, subfield, sectors, devices
+                    )
+                logger.debug("  → Returned %d channels", len(result))
                 return result
             except ValueError as e:
                 return {"error": str(e)}
@@ -285,12 +418,12 @@ class MiddleLayerPipeline(BasePipeline):
                 List of common names (e.g., ['BPM 1', 'BPM 2', ...])
                 Returns empty list if not available.
             """
-            logger.info(f"Tool: get_common_names(system='{system}', family='{family}') called")
-            result = self.database.get_common_names(system, family)
+            logger.info("Tool: get_common_names(system=%r, family=%r) called", system, family)
+            result = database.get_common_names(system, family)
             if result is None:
                 logger.debug("  → No common names available")
                 return []
-            logger.debug(f"  → Returned {len(result)} common names")
+            logger.debug("  → Returned %d common names", len(result))
             return result
 
         # Create the report_results tool with structured input
@@ -430,31 +563,34 @@ Example workflow:
 """
         return prompt
 
-    async def process_query(self, query: str) -> ChannelFinderResult:
+    async def process_query(self, query: str, use_cache: bool = True) -> ChannelFinderResult:
         """
         Execute middle layer pipeline.
 
         Stages:
         0. Detect explicit channel addresses (optimization)
         1. Split query (if needed)
-        2. For each sub-query, run React agent with tools
+        2. Run React agent with tools for all sub-queries concurrently
         3. Aggregate results
 
         Args:
             query: Natural language query
+            use_cache: Reuse recent query splits and agent results for repeated
+                queries (disable for benchmarking)
 
         Returns:
             ChannelFinderResult with found channels
         """
-        # Handle empty query
-        if not query or not query.strip():
+        # Handle empty query before any logging, config or LLM work
+        stripped_query = query.strip() if query else ""
+        if not stripped_query:
             return ChannelFinderResult(
                 query=query, channels=[], total_channels=0, processing_notes="Empty query provided"
             )
 
         # Stage 0: Check for explicit channel addresses (optimization)
         logger.info("[bold cyan]Pre-check:[/bold cyan] Detecting explicit channel addresses...")
-        detection_result = await self._detect_explicit_channels(query)
+        detection_result = await self._detect_explicit_channels(stripped_query)
 
         # Track explicit channels separately
         explicit_channels = []
@@ -497,7 +633,9 @@ Example workflow:
 
         # Stage 1: Split query into atomic queries (optional)
         if self.query_splitting:
-            atomic_queries = await self._split_query(query)
+            atomic_queries = await self._cached_call(
+                "query_split", stripped_query, self._split_query, use_cache
+            )
             logger.info(
                 f"[bold cyan]Stage 1:[/bold cyan] Split into {len(atomic_queries)} atomic quer{'y' if len(atomic_queries) == 1 else 'ies'}"
             )
@@ -506,41 +644,59 @@ Example workflow:
                 for i, aq in enumerate(atomic_queries, 1):
                     logger.info(f"  → Query {i}: {aq}")
         else:
-            atomic_queries = [query]
+            atomic_queries = [stripped_query]
             logger.info(
                 "[bold cyan]Stage 1:[/bold cyan] Query splitting disabled, using original query"
             )
 
         # Stage 2: Process each query with React agent
-        all_channels = []
-        for i, atomic_query in enumerate(atomic_queries, 1):
-            if len(atomic_queries) == 1:
-                logger.info("[bold cyan]Stage 2:[/bold cyan] Querying database with React agent...")
-            else:
+        # Sub-queries are independent, so the agent runs are overlapped. Each
+        # task gets its own copy of the context, keeping API call logging
+        # context per query.
+        if len(atomic_queries) == 1:
+            logger.info("[bold cyan]Stage 2:[/bold cyan] Querying database with React agent...")
+        else:
+            for i, atomic_query in enumerate(atomic_queries, 1):
                 logger.info(
-                    f"[bold cyan]Stage 2 - Query {i}/{len(atomic_queries)}:[/bold cyan] {atomic_query}"
+                    "[bold cyan]Stage 2 - Query %d/%d:[/bold cyan] %s",
+                    i,
+                    len(atomic_queries),
+                    atomic_query,
                 )
 
-            try:
-                result = await self._query_with_agent(atomic_query)
-                all_channels.extend(result["channels"])
-                logger.info(f"  → Found {len(result['channels'])} channel(s)")
-                logger.info(f"  [dim]→ {result['description']}[/dim]")
-            except Exception as e:
+        results = await asyncio.gather(
+            *(
+                self._cached_call("agent", atomic_query, self._query_with_agent, use_cache)
+                for atomic_query in atomic_queries
+            ),
+            return_exceptions=True,
+        )
+
+        # Insertion-ordered dict deduplicates channels as they are collected
+        seen_channels: dict[str, None] = {}
+        for i, result in enumerate(results, 1):
+            prefix = f"  → Query {i}: " if len(atomic_queries) > 1 else "  → "
+            if isinstance(result, Exception):
                 # Re-raise rate limit errors so callers can retry
-                error_str = str(e)
+                error_str = str(result)
                 if (
                     "RateLimitError" in error_str
                     or "rate limit" in error_str.lower()
                     or "Error code: 429" in error_str
                 ):
-                    raise
-                logger.error(f"  [red]✗[/red] Error processing query: {e}")
+                    raise result
+                logger.error(f"  [red]✗[/red] Error processing query {i}: {result}")
                 continue
+            if isinstance(result, BaseException):
+                raise result
+
+            seen_channels.update(dict.fromkeys(result["channels"]))
+            logger.info(f"{prefix}Found {len(result['channels'])} channel(s)")
+            logger.info(f"  [dim]→ {result['description']}[/dim]")
 
         # Stage 3: Merge explicit channels with search results and deduplicate
-        all_channels.extend(explicit_channels)
-        unique_channels = list(dict.fromkeys(all_channels))  # Preserve order while deduplicating
+        seen_channels.update(dict.fromkeys(explicit_channels))
+        unique_channels = tuple(seen_channels)
 
         return self._build_result(query, unique_channels)
 
@@ -549,7 +705,7 @@ Example workflow:
         prompt = self.query_splitter.get_prompt(facility_name=self.facility_name)
         message = f"{prompt}\n\nQuery to process: {query}"
 
-        _save_prompt_to_file(message, "query_split", query)
+        await asyncio.to_thread(_save_prompt_to_file, message, "query_split", query)
 
         # Set caller context for API call logging
         from osprey.models import set_api_call_context
@@ -586,8 +742,7 @@ Example workflow:
         agent = await self._get_agent()
 
         # Build prompt with system context
-        system_prompt = self._get_system_prompt()
-        full_query = f"{system_prompt}\n\nUser Query: {query}"
+        full_query = f"{self._system_prompt}\n\nUser Query: {query}"
 
         # Run LangGraph agent with rate-limit retry
         max_retries = 3
@@ -648,7 +803,7 @@ Example workflow:
             "description": f"WARNING: Agent did not report results properly. Agent response: {fallback_description}",
         }
 
-    def _build_result(self, query: str, channels_list: list[str]) -> ChannelFinderResult:
+    def _build_result(self, query: str, channels_list: Sequence[str]) -> ChannelFinderResult:
         """
         Build final result object.
 
@@ -657,9 +812,11 @@ Example workflow:
 
         For middle layer database: channel name = address, descriptions are at
         hierarchy branch points (system/family/field), not individual PVs.
+        Since every field is already known to be well-formed, models are built
+        with ``model_construct`` to skip redundant Pydantic validation.
         """
         channel_infos = [
-            ChannelInfo(
+            ChannelInfo.model_construct(
                 channel=channel_address,
                 address=channel_address,
                 description=None,
@@ -672,7 +829,7 @@ Example workflow:
             f"Found {len(channel_infos)} channels."
         )
 
-        return ChannelFinderResult(
+        return ChannelFinderResult.model_construct(
             query=query,
             channels=channel_infos,
             total_channels=len(channel_infos),
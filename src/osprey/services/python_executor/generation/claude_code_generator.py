@@ -133,8 +133,12 @@ Examples:
 
 from __future__ import annotations
 
+import datetime
+import json
 import os
-import re
+import time
+from collections.abc import Callable
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
@@ -185,6 +189,7 @@ except ImportError:
 
 from ..exceptions import CodeGenerationError
 from ..models import ExecutionError, PythonExecutionRequest
+from .code_extraction import clean_generated_code, extract_code_from_text, looks_like_python_code
 
 logger = get_logger("claude_code_generator")
 
@@ -197,6 +202,182 @@ except ImportError:
     LANGGRAPH_STREAMING_AVAILABLE = False
     get_stream_writer = None  # type: ignore
 
+# Use orjson for indented JSON if installed (optional - falls back to stdlib json)
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None  # type: ignore
+
+
+def _dumps_indented(obj: Any) -> str:
+    """Serialize to 2-space indented JSON, preferring orjson when available.
+
+    Only used for files written to the prompts directory. orjson writes
+    non-ASCII text unescaped and NaN/Infinity as ``null``, so prompt text keeps
+    using :func:`json.dumps`. Inputs orjson rejects (e.g. non-string dict keys)
+    also fall back to the stdlib.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2)
+
+
+# Tools denied by the PreToolUse safety hook (second layer after disallowed_tools)
+_DANGEROUS_TOOLS: frozenset[str] = frozenset(
+    {"Write", "Edit", "MultiEdit", "Delete", "Bash", "Python", "Execute"}
+)
+_DENY_REASON_SUFFIX = (
+    " not allowed during code generation. Generator may only read code for context."
+)
+# Invariant part of the hook's deny payload; only the reason varies per tool
+_DENY_HOOK_OUTPUT: dict[str, str] = {"hookEventName": "PreToolUse", "permissionDecision": "deny"}
+
+# Stream preview lengths and default cap on text retained in generation metadata
+_TEXT_PREVIEW_CHARS = 200
+_THINKING_PREVIEW_CHARS = 300
+_DEFAULT_MAX_RETAINED_CHARS = 8192
+_STREAM_TOOL_INPUT_CHARS = 100
+_TRUNC_SUFFIX = "..."
+
+# Conversation history entries are coalesced into one write per ~8 KB or 25 ms
+_HISTORY_FLUSH_CHARS = 8192
+_HISTORY_FLUSH_INTERVAL_S = 0.025
+
+# =============================================================================
+# CONVERSATION HISTORY SERIALIZERS
+# =============================================================================
+# SDK messages and content blocks are concrete leaf classes, so serializers are
+# dispatched on ``type(obj)`` through dicts built once at import time.
+
+
+def _serialize_text_block(block: TextBlock) -> dict[str, Any]:
+    return {"type": "text", "text": block.text}
+
+
+def _serialize_thinking_block(block: ThinkingBlock) -> dict[str, Any]:
+    return {"type": "thinking", "thinking": block.thinking, "signature": block.signature}
+
+
+def _serialize_tool_use_block(block: ToolUseBlock) -> dict[str, Any]:
+    return {"type": "tool_use", "id": block.id, "name": block.name, "input": block.input}
+
+
+def _serialize_tool_result_block(block: ToolResultBlock) -> dict[str, Any]:
+    return {
+        "type": "tool_result",
+        "tool_use_id": block.tool_use_id,
+        "content": block.content,
+        "is_error": block.is_error,
+    }
+
+
+_ASSISTANT_BLOCK_SERIALIZERS = {
+    TextBlock: _serialize_text_block,
+    ThinkingBlock: _serialize_thinking_block,
+    ToolUseBlock: _serialize_tool_use_block,
+}
+
+_USER_BLOCK_SERIALIZERS = {
+    TextBlock: _serialize_text_block,
+    ToolResultBlock: _serialize_tool_result_block,
+}
+
+
+def _serialize_assistant_message(message: AssistantMessage, result: dict[str, Any]) -> None:
+    result["role"] = "assistant"
+    result["model"] = message.model
+    result["content"] = content = []
+    for block in message.content:
+        serializer = _ASSISTANT_BLOCK_SERIALIZERS.get(type(block))
+        if serializer:
+            content.append(serializer(block))
+    # Capture additional metadata
+    if message.parent_tool_use_id:
+        result["parent_tool_use_id"] = message.parent_tool_use_id
+    if message.error:
+        result["error"] = {"type": message.error.type, "message": message.error.message}
+
+
+def _serialize_user_message(message: UserMessage, result: dict[str, Any]) -> None:
+    result["role"] = "user"
+    # UserMessage.content can be a string or list of ContentBlocks
+    if isinstance(message.content, str):
+        result["content"] = [{"type": "text", "text": message.content}]
+    else:
+        result["content"] = content = []
+        for block in message.content:
+            serializer = _USER_BLOCK_SERIALIZERS.get(type(block))
+            if serializer:
+                content.append(serializer(block))
+    # Also capture parent_tool_use_id if present
+    if message.parent_tool_use_id:
+        result["parent_tool_use_id"] = message.parent_tool_use_id
+
+
+def _serialize_system_message(message: SystemMessage, result: dict[str, Any]) -> None:
+    result["role"] = "system"
+    result["subtype"] = message.subtype
+    result["data"] = message.data
+
+
+def _serialize_result_message(message: ResultMessage, result: dict[str, Any]) -> None:
+    result["role"] = "result"
+    result["result_data"] = {
+        "subtype": message.subtype,
+        "is_error": message.is_error,
+        "num_turns": message.num_turns,
+        "duration_ms": message.duration_ms,
+        "total_cost_usd": message.total_cost_usd,
+        "result": message.result,
+    }
+
+
+# Message serializers fill in role-specific fields of the history entry
+_MESSAGE_SERIALIZERS = {
+    AssistantMessage: _serialize_assistant_message,
+    UserMessage: _serialize_user_message,
+    SystemMessage: _serialize_system_message,
+    ResultMessage: _serialize_result_message,
+}
+
+
+# =============================================================================
+# TOOL INPUT LOG FORMATTERS
+# =============================================================================
+# Checked in priority order; the first key present in the tool input selects
+# the formatter, otherwise the first few parameters are shown generically.
+
+
+def _format_file_tool_input(tool_input: dict[str, Any]) -> str:
+    # Read/Grep tools
+    file_path = tool_input.get("target_file", "")
+    if "pattern" in tool_input:
+        return f"searching '{tool_input.get('pattern', '')[:50]}' in {file_path}"
+    return f"reading {file_path}"
+
+
+def _format_glob_tool_input(tool_input: dict[str, Any]) -> str:
+    return f"finding files matching '{tool_input.get('glob_pattern', '')}'"
+
+
+def _format_path_tool_input(tool_input: dict[str, Any]) -> str:
+    # Generic path-based tool
+    return f"path={tool_input.get('path', '')}"
+
+
+_TOOL_INPUT_LOG_FORMATTERS: tuple[tuple[str, Callable[[dict[str, Any]], str]], ...] = (
+    ("target_file", _format_file_tool_input),
+    ("glob_pattern", _format_glob_tool_input),
+    ("path", _format_path_tool_input),
+)
+_TOOL_INPUT_LOG_MAX_PARAMS = 3
+
 
 class ClaudeCodeGenerator:
     """Claude Code SDK-based code generator.
@@ -287,11 +468,37 @@ class ClaudeCodeGenerator:
         # Stream writer (set during generation if available)
         self._stream_writer = None
 
+        # Bound on thinking/tool-input text kept in generation_metadata per block
+        self._max_retained_chars = self.config.get(
+            "max_retained_thinking_chars", _DEFAULT_MAX_RETAINED_CHARS
+        )
+
+        # Config-only prompt "shells" rendered once per generator
+        self._phase_prompt_heads: dict[tuple[str, tuple[str, ...]], str] = {}
+        self._phase_prompt_tails: dict[str, str] = {}
+
+        # Rendered structured-plan sections keyed by id(plan); plans are reused across retries
+        self._plan_text_cache: dict[int, tuple[Any, list[str]]] = {}
+
         # Save prompts: save all prompts and responses for transparency
         self._save_prompts = self.config.get("save_prompts", False)
         self._prompt_data: dict[str, Any] = {}  # Stores prompts/responses for inspection
         self._execution_folder: Path | None = None  # Set during generation
 
+        # Conversation history is streamed to disk as messages arrive, not retained
+        self._history_enabled = False
+        self._history_file = None  # Async file handle, opened on first flush
+        self._history_count = 0
+        self._history_pending: list[str] = []  # Serialized entries awaiting a flush
+        self._history_pending_chars = 0
+        self._history_last_flush = 0.0
+
+        # Per-block metadata entries are only built when something will keep them
+        self._store_thinking_blocks = self._save_prompts or self.config.get(
+            "store_thinking_blocks", True
+        )
+        self._store_tool_uses = self._save_prompts or self.config.get("store_tool_uses", True)
+
         # Compact initialization logging
         save_prompts_indicator = " [SAVE_PROMPTS]" if self._save_prompts else ""
         phases = self.config.get("profile_phases", ["generate"])
@@ -342,6 +549,11 @@ class ClaudeCodeGenerator:
                 "model": profile.get("model", "claude-haiku-4-5-20251001"),
                 "max_turns": profile.get("max_turns", 5),
                 "max_budget_usd": profile.get("max_budget_usd", 0.50),
+                "max_retained_thinking_chars": profile.get(
+                    "max_retained_thinking_chars", _DEFAULT_MAX_RETAINED_CHARS
+                ),
+                "store_thinking_blocks": profile.get("store_thinking_blocks", True),
+                "store_tool_uses": profile.get("store_tool_uses", True),
                 "save_prompts": profile.get(
                     "save_prompts", True
                 ),  # Default to True for transparency
@@ -366,6 +578,11 @@ class ClaudeCodeGenerator:
                 "model": self.model_config.get("model", "claude-haiku-4-5-20251001"),
                 "max_turns": self.model_config.get("max_turns", 5),
                 "max_budget_usd": self.model_config.get("max_budget_usd", 0.50),
+                "max_retained_thinking_chars": self.model_config.get(
+                    "max_retained_thinking_chars", _DEFAULT_MAX_RETAINED_CHARS
+                ),
+                "store_thinking_blocks": self.model_config.get("store_thinking_blocks", True),
+                "store_tool_uses": self.model_config.get("store_tool_uses", True),
                 "save_prompts": self.model_config.get(
                     "save_prompts", True
                 ),  # Default to True for transparency
@@ -618,7 +835,8 @@ class ClaudeCodeGenerator:
         - system_prompt.txt: The base system instructions
         - phase_prompts/: Individual prompts sent to each phase
         - responses/: Claude's responses from each phase
-        - conversation_full.json: Complete conversation history
+        - conversation_full.json: Complete conversation history (written incrementally
+          by :meth:`_write_history_entry` while responses are collected)
         - example_scripts/: Content of available example scripts
         - metadata.json: Generation metadata (thinking, tools, costs)
         """
@@ -626,8 +844,6 @@ class ClaudeCodeGenerator:
             return
 
         try:
-            import json
-
             prompts_dir = self._execution_folder / "prompts"
             prompts_dir.mkdir(exist_ok=True)
 
@@ -651,13 +867,6 @@ class ClaudeCodeGenerator:
                 for phase_name, response in self._prompt_data["phase_responses"].items():
                     (responses_dir / f"{phase_name}.txt").write_text(response, encoding="utf-8")
 
-            # Save complete conversation history
-            if "conversation_history" in self._prompt_data:
-                (prompts_dir / "conversation_full.json").write_text(
-                    json.dumps(self._prompt_data["conversation_history"], indent=2),
-                    encoding="utf-8",
-                )
-
             # Save example scripts content
             if "example_scripts" in self._prompt_data:
                 scripts_dir = prompts_dir / "example_scripts"
@@ -668,15 +877,14 @@ class ClaudeCodeGenerator:
             # Save metadata (thinking blocks, tool uses, costs)
             metadata = {
                 "generation_metadata": self.generation_metadata,
+                "conversation_messages": self._history_count,
                 "config": {
                     "profile": self.config.get("profile"),
                     "phases": self.config.get("profile_phases"),
                     "model": self.config.get("model"),
                 },
             }
-            (prompts_dir / "metadata.json").write_text(
-                json.dumps(metadata, indent=2), encoding="utf-8"
-            )
+            (prompts_dir / "metadata.json").write_text(_dumps_indented(metadata), encoding="utf-8")
 
             logger.info(f"💾 Prompts saved to: {prompts_dir}")
 
@@ -720,6 +928,10 @@ class ClaudeCodeGenerator:
             "total_thinking_tokens": 0,
         }
 
+        # Cached plan text only needs to survive retries of the same request
+        if not error_chain:
+            self._plan_text_cache.clear()
+
         # Set execution folder for saving prompts
         logger.info(
             f"🔍 save_prompts check: _save_prompts={self._save_prompts}, has_attr={hasattr(request, 'execution_folder_path')}, path={getattr(request, 'execution_folder_path', None)}"
@@ -734,11 +946,17 @@ class ClaudeCodeGenerator:
             self._prompt_data = {
                 "phase_prompts": {},
                 "phase_responses": {},
-                "conversation_history": [],
                 "example_scripts": {},
             }
+            self._history_enabled = True
+            self._history_count = 0
+            self._history_pending = []
+            self._history_pending_chars = 0
             logger.info(f"📝 Will save prompts to: {self._execution_folder / 'prompts'}")
-        elif self._save_prompts:
+        else:
+            self._history_enabled = False
+
+        if self._save_prompts and not self._history_enabled:
             logger.warning(
                 f"⚠️  save_prompts=True but cannot save: has_execution_folder_path={hasattr(request, 'execution_folder_path')}, path={getattr(request, 'execution_folder_path', None)}"
             )
@@ -783,8 +1001,20 @@ class ClaudeCodeGenerator:
         finally:
             # Save prompts if enabled
             if self._save_prompts:
+                await self._close_history_file()
                 self._save_prompt_data()
 
+    def _error_context(self, error_chain: list[ExecutionError]) -> dict[str, Any]:
+        """Build the retry bookkeeping arguments shared by every CodeGenerationError.
+
+        Args:
+            error_chain: Previous errors for this request
+
+        Returns:
+            Keyword arguments for ``generation_attempt`` and ``error_chain``
+        """
+        return {"generation_attempt": len(error_chain) + 1, "error_chain": error_chain}
+
     def _get_stream_writer(self):
         """Get LangGraph stream writer if available.
 
@@ -898,8 +1128,7 @@ class ClaudeCodeGenerator:
             # This should never happen - config always defines phases
             raise CodeGenerationError(
                 "No phase definitions found in configuration. Please check claude_generator_config.yml",
-                generation_attempt=len(error_chain) + 1,
-                error_chain=error_chain,
+                **self._error_context(error_chain),
             )
 
         # Use ClaudeSDKClient for stateful multi-turn conversation
@@ -1018,8 +1247,7 @@ class ClaudeCodeGenerator:
                             else:
                                 raise CodeGenerationError(
                                     f"No code found in {phase_name} phase response (got {len(response)} chars)",
-                                    generation_attempt=len(error_chain) + 1,
-                                    error_chain=error_chain,
+                                    **self._error_context(error_chain),
                                 )
 
                         # Calculate total workflow time
@@ -1041,16 +1269,14 @@ class ClaudeCodeGenerator:
                 # If we get here without returning, no code-generating phase was run
                 raise CodeGenerationError(
                     "No code-generating phase (generate/implement) in workflow - cannot produce code",
-                    generation_attempt=len(error_chain) + 1,
-                    error_chain=error_chain,
+                    **self._error_context(error_chain),
                 )
 
         except ClaudeSDKError as e:
             logger.error(f"Claude SDK error during phased generation: {e}")
             raise CodeGenerationError(
                 f"Phased generation failed: {str(e)}",
-                generation_attempt=len(error_chain) + 1,
-                error_chain=error_chain,
+                **self._error_context(error_chain),
             ) from e
 
     async def _execute_query(
@@ -1099,28 +1325,22 @@ class ClaudeCodeGenerator:
                                 {
                                     "type": "claude_code",
                                     "event": "text",
-                                    "content": block.text[:200],  # Preview
+                                    "content": block.text[:_TEXT_PREVIEW_CHARS],  # Preview
                                     "length": len(block.text),
                                 }
                             )
 
                         elif isinstance(block, ThinkingBlock):
                             # Track thinking for LangGraph state and debugging
-                            thinking_entry = {
-                                "content": block.thinking,
-                                "signature": block.signature,
-                                "length": len(block.thinking),
-                            }
-                            thinking_content.append(thinking_entry)
+                            thinking_content.append(self._thinking_entry(block))
 
                             # Stream Claude's reasoning process (but don't log each one)
                             self._stream(
                                 {
                                     "type": "claude_code",
                                     "event": "thinking",
-                                    "preview": block.thinking[
-                                        :300
-                                    ],  # Give users insight into reasoning
+                                    # Give users insight into reasoning
+                                    "preview": block.thinking[:_THINKING_PREVIEW_CHARS],
                                     "length": len(block.thinking),
                                     "signature": block.signature,
                                 }
@@ -1128,7 +1348,11 @@ class ClaudeCodeGenerator:
 
                         elif isinstance(block, ToolUseBlock):
                             # Track tool usage for debugging and security audit
-                            tool_entry = {"name": block.name, "id": block.id, "input": block.input}
+                            tool_entry = {
+                                "name": block.name,
+                                "id": block.id,
+                                "input": self._bound_tool_input(block.input),
+                            }
                             tool_uses.append(tool_entry)
 
                             # Stream tool usage for transparency (but don't log each one)
@@ -1149,8 +1373,7 @@ class ClaudeCodeGenerator:
                             error_msg += f": {message.result}"
                         raise CodeGenerationError(
                             error_msg,
-                            generation_attempt=len(error_chain) + 1,
-                            error_chain=error_chain,
+                            **self._error_context(error_chain),
                             technical_details={
                                 "subtype": message.subtype,
                                 "turns": message.num_turns,
@@ -1163,8 +1386,7 @@ class ClaudeCodeGenerator:
                     if message.subtype == "error_max_budget_usd":
                         raise CodeGenerationError(
                             f"Budget exceeded: ${message.total_cost_usd:.4f}",
-                            generation_attempt=len(error_chain) + 1,
-                            error_chain=error_chain,
+                            **self._error_context(error_chain),
                             technical_details={
                                 "subtype": "budget_exceeded",
                                 "cost": message.total_cost_usd,
@@ -1210,8 +1432,7 @@ class ClaudeCodeGenerator:
             if not result_text:
                 raise CodeGenerationError(
                     "Claude Code did not generate valid response",
-                    generation_attempt=len(error_chain) + 1,
-                    error_chain=error_chain,
+                    **self._error_context(error_chain),
                     technical_details={
                         "had_thinking": len(thinking_content) > 0,
                         "had_tools": len(tool_uses) > 0,
@@ -1223,8 +1444,7 @@ class ClaudeCodeGenerator:
                 if not code:
                     raise CodeGenerationError(
                         "No code found in Claude Code response",
-                        generation_attempt=len(error_chain) + 1,
-                        error_chain=error_chain,
+                        **self._error_context(error_chain),
                         technical_details={
                             "response_length": len(result_text),
                             "had_thinking": len(thinking_content) > 0,
@@ -1240,8 +1460,7 @@ class ClaudeCodeGenerator:
             logger.error(f"Claude Code CLI connection failed: {e}")
             raise CodeGenerationError(
                 "Failed to connect to Claude Code CLI. Ensure it is installed and accessible.",
-                generation_attempt=len(error_chain) + 1,
-                error_chain=error_chain,
+                **self._error_context(error_chain),
                 technical_details={
                     "error_type": "CLIConnectionError",
                     "details": str(e),
@@ -1252,16 +1471,14 @@ class ClaudeCodeGenerator:
             logger.error(f"Claude SDK error: {e}")
             raise CodeGenerationError(
                 f"Claude SDK error: {str(e)}",
-                generation_attempt=len(error_chain) + 1,
-                error_chain=error_chain,
+                **self._error_context(error_chain),
                 technical_details={"error_type": type(e).__name__, "details": str(e)},
             ) from e
         except Exception as e:
             logger.error(f"Unexpected error during code generation: {e}")
             raise CodeGenerationError(
                 f"Unexpected error: {str(e)}",
-                generation_attempt=len(error_chain) + 1,
-                error_chain=error_chain,
+                **self._error_context(error_chain),
                 technical_details={"error_type": type(e).__name__, "details": str(e)},
             ) from e
 
@@ -1281,6 +1498,9 @@ class ClaudeCodeGenerator:
         3. Common request details (task, query, expected results)
         4. Phase-specific additions (errors, structured plans, etc.)
 
+        Parts 1-2 and the scan/plan additions depend only on configuration and
+        workflow position, so they are rendered once and cached as prompt "shells".
+
         Args:
             phase_name: Name of the phase ("scan", "plan", "generate", "implement", etc.)
             request: Execution request with task details
@@ -1291,6 +1511,61 @@ class ClaudeCodeGenerator:
         Returns:
             Complete prompt string for the phase
         """
+        parts = [self._get_phase_prompt_head(phase_name, phase_def, executed_phases)]
+
+        # Add common request details
+        if request.task_objective:
+            parts.append(f"\n**Task Objective:** {request.task_objective}")
+
+        if request.user_query:
+            parts.append(f"\n**User Query:** {request.user_query}")
+
+        if request.expected_results:
+            parts.append(f"\n**Expected Results:** {request.expected_results}")
+
+        # Add phase-specific content
+        if phase_name in ("scan", "plan"):
+            parts.append(self._get_phase_prompt_tail(phase_name))
+
+        elif phase_name in ("generate", "implement"):
+            # Handle capability prompts
+            if request.capability_prompts:
+                parts.append("\n**Additional Guidance:**")
+                parts.extend(request.capability_prompts)
+
+            # Handle capability-driven structured plan
+            if hasattr(request, "structured_plan") and request.structured_plan is not None:
+                parts.extend(self._format_structured_plan(request.structured_plan))
+
+            # Handle error chain
+            if error_chain:
+                parts.append("\n**Previous Errors - Learn and Fix:**")
+                for error in error_chain[-2:]:
+                    parts.append(error.to_prompt_text())
+                parts.append("\nGenerate IMPROVED code that fixes these errors.")
+            else:
+                parts.append("\n**Final Step:** Generate the complete, executable Python code.")
+
+        return "\n".join(parts)
+
+    def _get_phase_prompt_head(
+        self, phase_name: str, phase_def: dict, executed_phases: list[str]
+    ) -> str:
+        """Get the cached base prompt and previous-phase context for a phase.
+
+        Args:
+            phase_name: Name of the phase
+            phase_def: Phase configuration from config file
+            executed_phases: List of phases already executed
+
+        Returns:
+            Prompt head, keyed by phase and the phases executed before it
+        """
+        key = (phase_name, tuple(executed_phases))
+        head = self._phase_prompt_heads.get(key)
+        if head is not None:
+            return head
+
         parts = [phase_def.get("prompt", "")]
 
         # Add phase-specific context about previous phases
@@ -1329,17 +1604,24 @@ class ClaudeCodeGenerator:
                     "You analyzed the codebase above. Now use those insights to generate high-quality code."
                 )
 
-        # Add common request details
-        if request.task_objective:
-            parts.append(f"\n**Task Objective:** {request.task_objective}")
+        head = "\n".join(parts)
+        self._phase_prompt_heads[key] = head
+        return head
 
-        if request.user_query:
-            parts.append(f"\n**User Query:** {request.user_query}")
+    def _get_phase_prompt_tail(self, phase_name: str) -> str:
+        """Get the cached closing instructions for the scan and plan phases.
 
-        if request.expected_results:
-            parts.append(f"\n**Expected Results:** {request.expected_results}")
+        Args:
+            phase_name: Either "scan" or "plan"
 
-        # Add phase-specific content
+        Returns:
+            Closing prompt text, including the example library listing for scan
+        """
+        tail = self._phase_prompt_tails.get(phase_name)
+        if tail is not None:
+            return tail
+
+        parts = []
         if phase_name == "scan":
             # Add codebase guidance
             codebase_guidance = self.config.get("codebase_guidance", {})
@@ -1368,37 +1650,25 @@ class ClaudeCodeGenerator:
                 "\n**Important:** Provide a clear, actionable implementation plan that will guide the code generation in the next phase."
             )
 
-        elif phase_name in ("generate", "implement"):
-            # Handle capability prompts
-            if request.capability_prompts:
-                parts.append("\n**Additional Guidance:**")
-                parts.extend(request.capability_prompts)
-
-            # Handle capability-driven structured plan
-            if hasattr(request, "structured_plan") and request.structured_plan is not None:
-                parts.extend(self._format_structured_plan(request.structured_plan))
-
-            # Handle error chain
-            if error_chain:
-                parts.append("\n**Previous Errors - Learn and Fix:**")
-                for error in error_chain[-2:]:
-                    parts.append(error.to_prompt_text())
-                parts.append("\nGenerate IMPROVED code that fixes these errors.")
-            else:
-                parts.append("\n**Final Step:** Generate the complete, executable Python code.")
-
-        return "\n".join(parts)
+        tail = "\n".join(parts)
+        self._phase_prompt_tails[phase_name] = tail
+        return tail
 
     def _format_structured_plan(self, plan) -> list[str]:
         """Format structured plan from capability into prompt sections.
 
+        The rendered sections are cached per plan object, since the same plan is
+        re-sent on every retry and only the error feedback changes.
+
         Args:
             plan: StructuredPlan object from capability
 
         Returns:
             List of prompt sections to append
         """
-        import json
+        cached = self._plan_text_cache.get(id(plan))
+        if cached is not None and cached[0] is plan:
+            return cached[1]
 
         sections = []
 
@@ -1429,6 +1699,8 @@ class ClaudeCodeGenerator:
                 "Replace placeholder values (like '<float>', '<string>') with actual computed values."
             )
 
+        # Keep a reference to the plan so its id() cannot be reused while cached
+        self._plan_text_cache[id(plan)] = (plan, sections)
         return sections
 
     async def _safety_hook(
@@ -1453,20 +1725,11 @@ class ClaudeCodeGenerator:
         """
         tool_name = input_data.get("tool_name", "")
 
-        dangerous_tools = ["Write", "Edit", "MultiEdit", "Delete", "Bash", "Python", "Execute"]
-
-        if tool_name in dangerous_tools:
+        if tool_name in _DANGEROUS_TOOLS:
             logger.warning(f"BLOCKED {tool_name} during code generation")
-            return {
-                "hookSpecificOutput": {
-                    "hookEventName": "PreToolUse",
-                    "permissionDecision": "deny",
-                    "permissionDecisionReason": (
-                        f"{tool_name} not allowed during code generation. "
-                        f"Generator may only read code for context."
-                    ),
-                }
-            }
+            deny = _DENY_HOOK_OUTPUT.copy()
+            deny["permissionDecisionReason"] = f"{tool_name}{_DENY_REASON_SUFFIX}"
+            return {"hookSpecificOutput": deny}
 
         return {}
 
@@ -1542,75 +1805,37 @@ and executed in a secure environment."""
         Returns:
             Complete response text
         """
-        response_text = ""
+        response_parts: list[str] = []
         thinking_blocks = []
         tool_uses = []
+        collected = {
+            "text": response_parts,
+            "thinking": thinking_blocks,
+            "thinking_chars": 0,
+            "tool_uses": tool_uses,
+        }
+        history_entry: dict[str, Any] = {}
 
         async for message in client.receive_response():
             # CAPTURE COMPLETE CONVERSATION HISTORY
             # Save EVERY message to conversation history for complete transparency
-            if self._save_prompts:
-                self._prompt_data["conversation_history"].append(
-                    self._serialize_message_for_history(message)
+            if self._history_enabled:
+                # Entries are serialized to text on write, so one dict is reused
+                await self._write_history_entry(
+                    self._serialize_message_for_history(message, out=history_entry)
                 )
 
             if isinstance(message, AssistantMessage):
                 for block in message.content:
-                    if isinstance(block, TextBlock):
-                        response_text += block.text + "\n"
-
-                        # Stream progress (but don't log text blocks)
-                        self._stream(
-                            {
-                                "type": "claude_code",
-                                "event": "text",
-                                "phase": phase,
-                                "content": block.text[:200],
-                                "length": len(block.text),
-                            }
-                        )
-
-                    elif isinstance(block, ThinkingBlock):
-                        thinking_entry = {
-                            "content": block.thinking,
-                            "signature": block.signature,
-                            "length": len(block.thinking),
-                        }
-                        thinking_blocks.append(thinking_entry)
-
-                        # Stream thinking (but don't log each one)
-                        self._stream(
-                            {
-                                "type": "claude_code",
-                                "event": "thinking",
-                                "phase": phase,
-                                "preview": block.thinking[:300],
-                                "length": len(block.thinking),
-                            }
-                        )
-
-                    elif isinstance(block, ToolUseBlock):
-                        tool_entry = {"name": block.name, "id": block.id, "input": block.input}
-                        tool_uses.append(tool_entry)
-
-                        # Stream tool usage (but don't log each one)
-                        self._stream(
-                            {
-                                "type": "claude_code",
-                                "event": "tool_use",
-                                "phase": phase,
-                                "tool": block.name,
-                                "input": self._sanitize_tool_input(block.input),
-                            }
-                        )
+                    handler = self._RESPONSE_BLOCK_HANDLERS.get(type(block))
+                    if handler:
+                        handler(self, block, phase, collected)
 
             elif isinstance(message, ResultMessage):
                 # Update metadata
                 self.generation_metadata["thinking_blocks"].extend(thinking_blocks)
                 self.generation_metadata["tool_uses"].extend(tool_uses)
-                self.generation_metadata["total_thinking_tokens"] += sum(
-                    t["length"] for t in thinking_blocks
-                )
+                self.generation_metadata["total_thinking_tokens"] += collected["thinking_chars"]
 
                 # Store cost and performance data
                 if message.total_cost_usd:
@@ -1633,7 +1858,165 @@ and executed in a secure environment."""
 
                 break
 
-        return response_text.strip()
+        return "\n".join(response_parts).strip()
+
+    def _collect_text_block(self, block: TextBlock, phase: str, collected: dict) -> None:
+        """Accumulate response text and stream a preview (text blocks are not logged)."""
+        text = block.text
+        collected["text"].append(text)
+        self._stream(
+            {
+                "type": "claude_code",
+                "event": "text",
+                "phase": phase,
+                "content": text[:_TEXT_PREVIEW_CHARS],
+                "length": len(text),
+            }
+        )
+
+    def _collect_thinking_block(self, block: ThinkingBlock, phase: str, collected: dict) -> None:
+        """Record a bounded thinking entry for metadata and stream a preview."""
+        thinking = block.thinking
+        collected["thinking_chars"] += len(thinking)
+        if self._store_thinking_blocks:
+            collected["thinking"].append(self._thinking_entry(block))
+        self._stream(
+            {
+                "type": "claude_code",
+                "event": "thinking",
+                "phase": phase,
+                "preview": thinking[:_THINKING_PREVIEW_CHARS],
+                "length": len(thinking),
+            }
+        )
+
+    def _collect_tool_use_block(self, block: ToolUseBlock, phase: str, collected: dict) -> None:
+        """Record a tool use for the security audit trail and stream it."""
+        if self._store_tool_uses:
+            collected["tool_uses"].append(
+                {"name": block.name, "id": block.id, "input": self._bound_tool_input(block.input)}
+            )
+        self._stream(
+            {
+                "type": "claude_code",
+                "event": "tool_use",
+                "phase": phase,
+                "tool": block.name,
+                "input": self._sanitize_tool_input(block.input),
+            }
+        )
+
+    def _thinking_entry(self, block: ThinkingBlock) -> dict[str, Any]:
+        """Build a metadata entry for a thinking block with its content capped.
+
+        Thinking blocks can be very large and generation_metadata lives as long as
+        the generator, so only the first ``max_retained_thinking_chars`` are kept.
+        The original length is always recorded.
+
+        Args:
+            block: Thinking block from Claude
+
+        Returns:
+            Entry with content, truncation flag, signature, and original length
+        """
+        thinking = block.thinking
+        length = len(thinking)
+        truncated = length > self._max_retained_chars
+        return {
+            "content": thinking[: self._max_retained_chars] if truncated else thinking,
+            "content_truncated": truncated,
+            "signature": block.signature,
+            "length": length,
+        }
+
+    def _bound_tool_input(self, tool_input: dict[str, Any]) -> dict[str, Any]:
+        """Cap long string values of a tool input before retaining it in metadata.
+
+        Args:
+            tool_input: Raw tool input from Claude
+
+        Returns:
+            The input itself if nothing exceeds the cap, otherwise a capped copy
+        """
+        limit = self._max_retained_chars
+        if not any(isinstance(v, str) and len(v) > limit for v in tool_input.values()):
+            return tool_input
+        return {
+            key: value[:limit] if isinstance(value, str) and len(value) > limit else value
+            for key, value in tool_input.items()
+        }
+
+    # Block handlers for _collect_response, dispatched on type(block)
+    _RESPONSE_BLOCK_HANDLERS = {
+        TextBlock: _collect_text_block,
+        ThinkingBlock: _collect_thinking_block,
+        ToolUseBlock: _collect_tool_use_block,
+    }
+
+    async def _write_history_entry(self, entry: dict[str, Any]) -> None:
+        """Append one serialized message to conversation_full.json on disk.
+
+        The file is a JSON array written element by element, so memory use stays
+        constant for long multi-phase runs. Entries are buffered and written in
+        batches once ~8 KB accumulate or 25 ms pass since the last write, and the
+        array is terminated by :meth:`_close_history_file`. Write failures disable
+        history saving for the rest of the generation instead of failing it.
+
+        Args:
+            entry: Serialized message from :meth:`_serialize_message_for_history`
+        """
+        try:
+            chunk = _dumps_indented(entry)
+            self._history_pending.append(chunk)
+            self._history_pending_chars += len(chunk)
+            self._history_count += 1
+            if (
+                self._history_pending_chars >= _HISTORY_FLUSH_CHARS
+                or time.monotonic() - self._history_last_flush >= _HISTORY_FLUSH_INTERVAL_S
+            ):
+                await self._flush_history()
+        except Exception as e:
+            logger.warning(f"Failed to save conversation history: {e}")
+            self._history_enabled = False
+
+    async def _flush_history(self) -> None:
+        """Write all buffered history entries with a single file write."""
+        if not self._history_pending:
+            return
+        batch = ",\n".join(self._history_pending)
+        self._history_pending = []
+        self._history_pending_chars = 0
+        if self._history_file is None:
+            import aiofiles
+
+            prompts_dir = self._execution_folder / "prompts"
+            prompts_dir.mkdir(parents=True, exist_ok=True)
+            self._history_file = await aiofiles.open(
+                prompts_dir / "conversation_full.json", "w", encoding="utf-8"
+            )
+            await self._history_file.write("[\n" + batch)
+        else:
+            await self._history_file.write(",\n" + batch)
+        self._history_last_flush = time.monotonic()
+
+    async def _close_history_file(self) -> None:
+        """Flush buffered entries, terminate the history array and close the file."""
+        try:
+            if self._history_enabled:
+                await self._flush_history()
+        except Exception as e:
+            logger.warning(f"Failed to save conversation history: {e}")
+        self._history_pending = []
+        self._history_pending_chars = 0
+        if self._history_file is None:
+            return
+        try:
+            await self._history_file.write("\n]\n")
+            await self._history_file.close()
+        except Exception as e:
+            logger.warning(f"Failed to close conversation history: {e}")
+        finally:
+            self._history_file = None
 
     def _looks_like_python_code(self, text: str) -> bool:
         """Check if text appears to be Python code without markdown formatting.
@@ -1644,159 +2027,57 @@ and executed in a secure environment."""
         Returns:
             True if text appears to be Python code
         """
-        # Check for common Python patterns
-        python_indicators = [
-            "import ",
-            "from ",
-            "def ",
-            "class ",
-            "if __name__",
-            "results = ",
-            "print(",
-        ]
-
-        # Must have at least 2 indicators
-        indicator_count = sum(1 for indicator in python_indicators if indicator in text)
-
-        # Check if it's wrapped in markdown code blocks (we handle those separately)
-        has_code_blocks = "```" in text
-
-        # If it has code blocks, return False (let normal extraction handle it)
-        # If it has enough Python indicators and no code blocks, it's likely raw Python
-        return indicator_count >= 2 and not has_code_blocks
+        return looks_like_python_code(text)
 
     def _extract_code_from_text(self, text: str) -> str | None:
         """Extract Python code from text.
 
-        Searches for code blocks in the response text using multiple patterns
-        to handle various formatting styles.
-
         Args:
             text: Response text from Claude
 
         Returns:
             Extracted code or None if no code found
         """
-        # Python code blocks
-        matches = re.findall(r"```python\n(.*?)\n```", text, re.DOTALL | re.IGNORECASE)
-        if matches:
-            return matches[-1].strip()
-
-        # Generic code blocks
-        matches = re.findall(r"```\n(.*?)\n```", text, re.DOTALL)
-        for match in matches:
-            if "import " in match or "def " in match:
-                return match.strip()
-
-        return None
+        return extract_code_from_text(text)
 
     def _clean_generated_code(self, raw_code: str) -> str:
         """Clean generated code.
 
-        Removes markdown formatting if present and normalizes whitespace.
-
         Args:
             raw_code: Raw extracted code
 
         Returns:
             Cleaned Python code
         """
-        cleaned = raw_code.strip()
-
-        # Remove markdown if present
-        markdown_pattern = r"^```\s*python\s*\n(.*?)\n```$"
-        match = re.match(markdown_pattern, cleaned, re.DOTALL | re.IGNORECASE)
-        if match:
-            cleaned = match.group(1).strip()
+        return clean_generated_code(raw_code)
 
-        return cleaned
-
-    def _serialize_message_for_history(self, message: Any) -> dict[str, Any]:
+    def _serialize_message_for_history(
+        self, message: Any, out: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
         """Serialize a Message object to JSON-serializable format for conversation history.
 
         Captures EVERYTHING: text, thinking, tool uses, tool results, metadata, etc.
 
         Args:
             message: Any Message type from Claude SDK (AssistantMessage, UserMessage, etc.)
+            out: Optional dict to clear and refill instead of allocating a new one.
+                Only pass one when the previous entry has already been consumed.
 
         Returns:
             JSON-serializable dict with complete message details
         """
-        import datetime
-
-        result = {
-            "type": type(message).__name__,
-            "timestamp": datetime.datetime.now().isoformat(),
-        }
-
-        if isinstance(message, AssistantMessage):
-            result["role"] = "assistant"
-            result["model"] = message.model
-            result["content"] = []
-            for block in message.content:
-                if isinstance(block, TextBlock):
-                    result["content"].append({"type": "text", "text": block.text})
-                elif isinstance(block, ThinkingBlock):
-                    result["content"].append(
-                        {
-                            "type": "thinking",
-                            "thinking": block.thinking,
-                            "signature": block.signature,
-                        }
-                    )
-                elif isinstance(block, ToolUseBlock):
-                    result["content"].append(
-                        {
-                            "type": "tool_use",
-                            "id": block.id,
-                            "name": block.name,
-                            "input": block.input,
-                        }
-                    )
-            # Capture additional metadata
-            if message.parent_tool_use_id:
-                result["parent_tool_use_id"] = message.parent_tool_use_id
-            if message.error:
-                result["error"] = {"type": message.error.type, "message": message.error.message}
-
-        elif isinstance(message, UserMessage):
-            result["role"] = "user"
-            # UserMessage.content can be a string or list of ContentBlocks
-            if isinstance(message.content, str):
-                result["content"] = [{"type": "text", "text": message.content}]
-            else:
-                result["content"] = []
-                for block in message.content:
-                    if isinstance(block, TextBlock):
-                        result["content"].append({"type": "text", "text": block.text})
-                    elif isinstance(block, ToolResultBlock):
-                        result["content"].append(
-                            {
-                                "type": "tool_result",
-                                "tool_use_id": block.tool_use_id,
-                                "content": block.content,
-                                "is_error": block.is_error,
-                            }
-                        )
-            # Also capture parent_tool_use_id if present
-            if message.parent_tool_use_id:
-                result["parent_tool_use_id"] = message.parent_tool_use_id
-
-        elif isinstance(message, SystemMessage):
-            result["role"] = "system"
-            result["subtype"] = message.subtype
-            result["data"] = message.data
-
-        elif isinstance(message, ResultMessage):
-            result["role"] = "result"
-            result["result_data"] = {
-                "subtype": message.subtype,
-                "is_error": message.is_error,
-                "num_turns": message.num_turns,
-                "duration_ms": message.duration_ms,
-                "total_cost_usd": message.total_cost_usd,
-                "result": message.result,
-            }
+        if out is None:
+            result = {}
+        else:
+            result = out
+            result.clear()
+        result["type"] = type(message).__name__
+        # Stamped per message: a phase can span many tool turns and minutes
+        result["timestamp"] = datetime.datetime.now().isoformat()
+
+        serializer = _MESSAGE_SERIALIZERS.get(type(message))
+        if serializer:
+            serializer(message, result)
         else:
             # Unknown message type - capture what we can
             result["raw"] = str(message)
@@ -1813,13 +2094,15 @@ and executed in a secure environment."""
             Sanitized version safe for streaming
         """
         # For now, just limit string lengths and remove large content
-        sanitized = {}
-        for key, value in tool_input.items():
-            if isinstance(value, str) and len(value) > 100:
-                sanitized[key] = value[:100] + "..."
-            else:
-                sanitized[key] = value
-        return sanitized
+        limit = _STREAM_TOOL_INPUT_CHARS
+        return {
+            key: (
+                value[:limit] + _TRUNC_SUFFIX
+                if type(value) is str and len(value) > limit
+                else value
+            )
+            for key, value in tool_input.items()
+        }
 
     def _format_tool_input_for_log(self, tool_input: dict[str, Any]) -> str:
         """Format tool input for readable logging.
@@ -1830,30 +2113,12 @@ and executed in a secure environment."""
         Returns:
             Human-readable string representation
         """
-        # Common tool patterns
-        if "target_file" in tool_input:
-            # Read/Grep tools
-            file_path = tool_input.get("target_file", "")
-            if "pattern" in tool_input:
-                # Grep
-                pattern = tool_input.get("pattern", "")[:50]
-                return f"searching '{pattern}' in {file_path}"
-            else:
-                # Read
-                return f"reading {file_path}"
-        elif "glob_pattern" in tool_input:
-            # Glob tool
-            pattern = tool_input.get("glob_pattern", "")
-            return f"finding files matching '{pattern}'"
-        elif "path" in tool_input:
-            # Generic path-based tool
-            return f"path={tool_input.get('path', '')}"
-        else:
-            # Generic representation
-            parts = []
-            for key, value in tool_input.items():
-                if isinstance(value, str):
-                    parts.append(f"{key}={value[:50]}")
-                else:
-                    parts.append(f"{key}={value}")
-            return ", ".join(parts[:3])  # Limit to 3 params
+        for key, formatter in _TOOL_INPUT_LOG_FORMATTERS:
+            if key in tool_input:
+                return formatter(tool_input)
+
+        # Generic representation of the first few params
+        return ", ".join(
+            f"{key}={value[:50]}" if isinstance(value, str) else f"{key}={value}"
+            for key, value in islice(tool_input.items(), _TOOL_INPUT_LOG_MAX_PARAMS)
+        )
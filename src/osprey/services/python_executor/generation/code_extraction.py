@@ -0,0 +1,107 @@
+"""Code extraction helpers for LLM-generated responses.
+
+Pure string-processing functions used by the Claude Code generator to pull Python
+code out of model responses. They are kept free of I/O and fully type-annotated so
+the module can be compiled ahead of time (e.g. ``mypyc code_extraction.py``) for
+deployments where response parsing shows up in profiles; the pure-Python module is
+used as-is otherwise.
+
+.. seealso::
+   :class:`osprey.services.python_executor.generation.claude_code_generator.ClaudeCodeGenerator`
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Final
+
+# Code fence markers and patterns for extracting code from responses
+_PYTHON_BLOCK_RE: Final = re.compile(r"```python\n(.*?)\n```", re.DOTALL | re.IGNORECASE)
+_GENERIC_BLOCK_RE: Final = re.compile(r"```\n(.*?)\n```", re.DOTALL)
+_MARKDOWN_WRAPPER_RE: Final = re.compile(
+    r"^```\s*python\s*\n(.*?)\n```$", re.DOTALL | re.IGNORECASE
+)
+
+# Common Python patterns; raw (unfenced) code must contain at least two
+_PYTHON_INDICATORS: Final = (
+    "import ",
+    "from ",
+    "def ",
+    "class ",
+    "if __name__",
+    "results = ",
+    "print(",
+)
+
+
+def looks_like_python_code(text: str) -> bool:
+    """Check if text appears to be Python code without markdown formatting.
+
+    Args:
+        text: Text to check
+
+    Returns:
+        True if text has at least two Python indicators and no code fences
+    """
+    # If it has code blocks, return False (let normal extraction handle it)
+    if "```" in text:
+        return False
+
+    indicator_count = 0
+    for indicator in _PYTHON_INDICATORS:
+        if indicator in text:
+            indicator_count += 1
+            if indicator_count >= 2:
+                return True
+    return False
+
+
+def extract_code_from_text(text: str) -> str | None:
+    """Extract Python code from text.
+
+    Searches for code blocks in the response text using multiple patterns
+    to handle various formatting styles. When several python blocks are
+    present (in any fence casing), the last one is used.
+
+    Args:
+        text: Response text from the model
+
+    Returns:
+        Extracted code or None if no code found
+    """
+    if "```" not in text:
+        return None
+
+    # Python code blocks
+    matches = _PYTHON_BLOCK_RE.findall(text)
+    if matches:
+        return matches[-1].strip()
+
+    # Generic code blocks
+    for match in _GENERIC_BLOCK_RE.finditer(text):
+        code = match.group(1)
+        if "import " in code or "def " in code:
+            return code.strip()
+
+    return None
+
+
+def clean_generated_code(raw_code: str) -> str:
+    """Clean generated code.
+
+    Removes markdown formatting if present and normalizes whitespace.
+
+    Args:
+        raw_code: Raw extracted code
+
+    Returns:
+        Cleaned Python code
+    """
+    cleaned = raw_code.strip()
+
+    # Remove markdown if present
+    match = _MARKDOWN_WRAPPER_RE.match(cleaned)
+    if match:
+        cleaned = match.group(1).strip()
+
+    return cleaned
@@ -10,68 +10,86 @@ from unittest.mock import patch
 import pytest
 from click.testing import CliRunner
 
+from osprey.cli import claude_cmd
 from osprey.cli.claude_cmd import (
     claude,
     get_claude_skills_dir,
     get_installed_skills,
     install_skill,
     list_skills,
+    parse_task_frontmatter,
 )
 
+# Relative to the install root; the install tests point it at tmp_path
+_SKILLS_DIR = Path(".claude/skills")
+_MIGRATE_SKILL_DIR = Path(".claude/skills/migrate")
+
+# Mock assist file contents, pre-encoded for write_bytes
+_MIGRATE_INSTRUCTIONS_BYTES = b"# Migration Assistant\n\nUpgrade downstream projects.\n"
+_PRECOMMIT_INSTRUCTIONS_BYTES = b"# Pre-Commit Validation\n\nValidate code before commits.\n"
+_TESTING_INSTRUCTIONS_BYTES = b"# Testing Workflow\n\nTesting guide.\n"
+_MIGRATE_SKILL_BYTES = b"---\nname: osprey-migrate\n---\n\n# Migration\n\nFollow instructions.md\n"
+_PRECOMMIT_SKILL_BYTES = b"---\nname: osprey-pre-commit\n---\n\n# Pre-Commit\n\nRun checks.\n"
+
+# Mock assist tree: three tasks, with Claude Code integrations for migrate and
+# pre-commit only (testing-workflow has none)
+_MOCK_ASSIST_LAYOUT = (
+    ("tasks/migrate/instructions.md", _MIGRATE_INSTRUCTIONS_BYTES),
+    ("tasks/pre-commit/instructions.md", _PRECOMMIT_INSTRUCTIONS_BYTES),
+    ("tasks/testing-workflow/instructions.md", _TESTING_INSTRUCTIONS_BYTES),
+    ("integrations/claude_code/migrate/SKILL.md", _MIGRATE_SKILL_BYTES),
+    ("integrations/claude_code/pre-commit/SKILL.md", _PRECOMMIT_SKILL_BYTES),
+)
 
-@pytest.fixture
+
+@pytest.fixture(scope="session")
 def cli_runner():
-    """Provide a Click CLI test runner."""
+    """Provide a Click CLI test runner shared by the session; no test reconfigures it."""
     return CliRunner()
 
 
 @pytest.fixture
-def mock_assist_path(tmp_path):
-    """Create a mock assist directory with tasks and integrations."""
-    # Create tasks directory
-    tasks_dir = tmp_path / "tasks"
-    tasks_dir.mkdir()
-
-    # Create migrate task
-    migrate_dir = tasks_dir / "migrate"
-    migrate_dir.mkdir()
-    (migrate_dir / "instructions.md").write_text(
-        "# Migration Assistant\n\nUpgrade downstream projects.\n"
-    )
+def skill_dir(tmp_path):
+    """Provide the path the migrate skill is installed to under tmp_path."""
+    return tmp_path / _MIGRATE_SKILL_DIR
 
-    # Create pre-commit task
-    precommit_dir = tasks_dir / "pre-commit"
-    precommit_dir.mkdir()
-    (precommit_dir / "instructions.md").write_text(
-        "# Pre-Commit Validation\n\nValidate code before commits.\n"
-    )
 
-    # Create testing-workflow task (no Claude integration)
-    testing_dir = tasks_dir / "testing-workflow"
-    testing_dir.mkdir()
-    (testing_dir / "instructions.md").write_text("# Testing Workflow\n\nTesting guide.\n")
+@pytest.fixture(scope="module")
+def claude_help_result(cli_runner):
+    """Invoke 'osprey claude --help' once for the help text tests."""
+    return cli_runner.invoke(claude, ["--help"])
 
-    # Create integrations directory
-    integrations_dir = tmp_path / "integrations"
-    integrations_dir.mkdir()
 
-    # Create claude_code integration for migrate and pre-commit
-    claude_code_dir = integrations_dir / "claude_code"
-    claude_code_dir.mkdir()
+@pytest.fixture(scope="session")
+def mock_assist_path(tmp_path_factory):
+    """Create a mock assist directory with tasks and integrations.
 
-    migrate_skill_dir = claude_code_dir / "migrate"
-    migrate_skill_dir.mkdir()
-    (migrate_skill_dir / "SKILL.md").write_text(
-        "---\nname: osprey-migrate\n---\n\n# Migration\n\nFollow instructions.md\n"
-    )
+    Session-scoped: tests only read this tree; installs write under tmp_path.
+    tmp_path_factory already gives each xdist worker its own base directory.
+    """
+    assist_dir = tmp_path_factory.mktemp("assist")
+    for relpath, data in _MOCK_ASSIST_LAYOUT:
+        path = assist_dir / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    return assist_dir
 
-    precommit_skill_dir = claude_code_dir / "pre-commit"
-    precommit_skill_dir.mkdir()
-    (precommit_skill_dir / "SKILL.md").write_text(
-        "---\nname: osprey-pre-commit\n---\n\n# Pre-Commit\n\nRun checks.\n"
-    )
 
-    return tmp_path
+@pytest.fixture(autouse=True)
+def _clear_frontmatter_cache():
+    """Drop parsed frontmatter so no test sees another test's files."""
+    yield
+    claude_cmd._FRONTMATTER_CACHE.clear()
+
+
+@pytest.fixture(autouse=True)
+def _patch_roots(monkeypatch, mock_assist_path):
+    """Point the claude command at the mock assist tree."""
+    monkeypatch.setattr("osprey.cli.claude_cmd.get_tasks_root", lambda: mock_assist_path / "tasks")
+    monkeypatch.setattr(
+        "osprey.cli.claude_cmd.get_integrations_root", lambda: mock_assist_path / "integrations"
+    )
 
 
 class TestGetClaudeSkillsDir:
@@ -80,7 +98,35 @@ class TestGetClaudeSkillsDir:
     def test_returns_path_in_cwd(self):
         """Test that function returns path in current working directory."""
         result = get_claude_skills_dir()
-        assert result == Path.cwd() / ".claude" / "skills"
+        assert result == Path.cwd() / _SKILLS_DIR
+
+
+class TestParseTaskFrontmatter:
+    """Test the parse_task_frontmatter() function."""
+
+    def test_reparses_after_file_changes(self, monkeypatch, tmp_path):
+        """Test that an edited instructions.md is not served from the cache."""
+        monkeypatch.setattr("osprey.cli.claude_cmd.get_tasks_root", lambda: tmp_path)
+        instructions = tmp_path / "demo" / "instructions.md"
+        instructions.parent.mkdir()
+        instructions.write_bytes(b"---\nskill_description: old\n---\n\n# Demo\n")
+        assert parse_task_frontmatter("demo") == {"skill_description": "old"}
+
+        instructions.write_bytes(b"---\nskill_description: newer\n---\n\n# Demo\n")
+
+        assert parse_task_frontmatter("demo") == {"skill_description": "newer"}
+        assert len(claude_cmd._FRONTMATTER_CACHE) == 1
+
+    def test_returns_empty_dict_for_missing_task(self):
+        """Test that a task without instructions.md has no frontmatter."""
+        assert parse_task_frontmatter("does-not-exist") == {}
+
+    def test_returns_empty_dict_when_task_path_is_a_file(self, monkeypatch, tmp_path):
+        """Test that a task name pointing at a file is tolerated like a missing task."""
+        monkeypatch.setattr("osprey.cli.claude_cmd.get_tasks_root", lambda: tmp_path)
+        (tmp_path / "demo").write_bytes(b"not a directory")
+
+        assert parse_task_frontmatter("demo") == {}
 
 
 class TestGetInstalledSkills:
@@ -89,13 +135,13 @@ class TestGetInstalledSkills:
     def test_returns_empty_list_when_no_skills_dir(self, tmp_path):
         """Test that function returns empty list when .claude/skills doesn't exist."""
         with patch("osprey.cli.claude_cmd.get_claude_skills_dir") as mock_dir:
-            mock_dir.return_value = tmp_path / ".claude" / "skills"
+            mock_dir.return_value = tmp_path / _SKILLS_DIR
             result = get_installed_skills()
             assert result == []
 
     def test_returns_list_of_installed_skills(self, tmp_path):
         """Test that function returns installed skill names."""
-        skills_dir = tmp_path / ".claude" / "skills"
+        skills_dir = tmp_path / _SKILLS_DIR
         skills_dir.mkdir(parents=True)
         (skills_dir / "migrate").mkdir()
         (skills_dir / "pre-commit").mkdir()
@@ -111,168 +157,76 @@ class TestGetInstalledSkills:
 class TestClaudeInstallCommand:
     """Test the 'osprey claude install' command."""
 
-    @patch("osprey.cli.claude_cmd.get_integrations_root")
-    @patch("osprey.cli.claude_cmd.get_tasks_root")
-    def test_install_creates_skill_directory(
-        self, mock_tasks_root, mock_int_root, cli_runner, mock_assist_path, tmp_path
-    ):
-        """Test that install command creates the skill directory."""
-        mock_tasks_root.return_value = mock_assist_path / "tasks"
-        mock_int_root.return_value = mock_assist_path / "integrations"
-
-        with cli_runner.isolated_filesystem(temp_dir=tmp_path):
-            result = cli_runner.invoke(install_skill, ["migrate"])
-
-            assert result.exit_code == 0
-            skill_dir = Path(".claude") / "skills" / "migrate"
-            assert skill_dir.exists()
-
-    @patch("osprey.cli.claude_cmd.get_integrations_root")
-    @patch("osprey.cli.claude_cmd.get_tasks_root")
-    def test_install_copies_skill_file(
-        self, mock_tasks_root, mock_int_root, cli_runner, mock_assist_path, tmp_path
-    ):
-        """Test that install command copies SKILL.md file."""
-        mock_tasks_root.return_value = mock_assist_path / "tasks"
-        mock_int_root.return_value = mock_assist_path / "integrations"
-
-        with cli_runner.isolated_filesystem(temp_dir=tmp_path):
-            result = cli_runner.invoke(install_skill, ["migrate"])
-
-            assert result.exit_code == 0
-            skill_file = Path(".claude") / "skills" / "migrate" / "SKILL.md"
-            assert skill_file.exists()
-            content = skill_file.read_text()
-            assert "osprey-migrate" in content
-
-    @patch("osprey.cli.claude_cmd.get_integrations_root")
-    @patch("osprey.cli.claude_cmd.get_tasks_root")
-    def test_install_copies_instructions(
-        self, mock_tasks_root, mock_int_root, cli_runner, mock_assist_path, tmp_path
-    ):
-        """Test that install command copies instructions.md."""
-        mock_tasks_root.return_value = mock_assist_path / "tasks"
-        mock_int_root.return_value = mock_assist_path / "integrations"
-
-        with cli_runner.isolated_filesystem(temp_dir=tmp_path):
-            result = cli_runner.invoke(install_skill, ["migrate"])
-
-            assert result.exit_code == 0
-            instructions_file = Path(".claude") / "skills" / "migrate" / "instructions.md"
-            assert instructions_file.exists()
-
-    @patch("osprey.cli.claude_cmd.get_integrations_root")
-    @patch("osprey.cli.claude_cmd.get_tasks_root")
-    def test_install_warns_when_exists(
-        self, mock_tasks_root, mock_int_root, cli_runner, mock_assist_path, tmp_path
-    ):
+    @pytest.fixture(autouse=True)
+    def _install_root(self, monkeypatch, tmp_path):
+        """Install skills under tmp_path instead of the current directory."""
+        monkeypatch.setattr("osprey.cli.claude_cmd._get_install_root", lambda: tmp_path)
+
+    def test_install_copies_skill_files(self, skill_dir):
+        """Test that install creates the skill directory with SKILL.md and instructions.md."""
+        install_skill.callback(task="migrate", force=False)
+
+        assert skill_dir.is_dir()
+        assert (skill_dir / "SKILL.md").read_bytes() == _MIGRATE_SKILL_BYTES
+        assert (skill_dir / "instructions.md").read_bytes() == _MIGRATE_INSTRUCTIONS_BYTES
+
+    def test_install_warns_when_exists(self, cli_runner, skill_dir):
         """Test that install warns when skill already exists."""
-        mock_tasks_root.return_value = mock_assist_path / "tasks"
-        mock_int_root.return_value = mock_assist_path / "integrations"
-
-        with cli_runner.isolated_filesystem(temp_dir=tmp_path):
-            # Create existing installation
-            skill_dir = Path(".claude") / "skills" / "migrate"
-            skill_dir.mkdir(parents=True)
-            (skill_dir / "SKILL.md").write_text("existing content")
-
-            result = cli_runner.invoke(install_skill, ["migrate"])
-
-            assert result.exit_code == 0
-            assert "already installed" in result.output
-            assert "--force" in result.output
-
-    @patch("osprey.cli.claude_cmd.get_integrations_root")
-    @patch("osprey.cli.claude_cmd.get_tasks_root")
-    def test_install_force_overwrites(
-        self, mock_tasks_root, mock_int_root, cli_runner, mock_assist_path, tmp_path
-    ):
+        # Create existing installation
+        skill_dir.mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_text("existing content")
+
+        result = cli_runner.invoke(install_skill, ["migrate"])
+
+        assert result.exit_code == 0
+        assert "already installed" in result.output
+        assert "--force" in result.output
+
+    def test_install_force_overwrites(self, cli_runner, skill_dir):
         """Test that install --force overwrites existing installation."""
-        mock_tasks_root.return_value = mock_assist_path / "tasks"
-        mock_int_root.return_value = mock_assist_path / "integrations"
-
-        with cli_runner.isolated_filesystem(temp_dir=tmp_path):
-            # Create existing installation
-            skill_dir = Path(".claude") / "skills" / "migrate"
-            skill_dir.mkdir(parents=True)
-            (skill_dir / "SKILL.md").write_text("old content")
-
-            result = cli_runner.invoke(install_skill, ["migrate", "--force"])
-
-            assert result.exit_code == 0
-            assert "Installed" in result.output
-            # Content should be updated
-            new_content = (skill_dir / "SKILL.md").read_text()
-            assert "osprey-migrate" in new_content
-
-    @patch("osprey.cli.claude_cmd.get_integrations_root")
-    @patch("osprey.cli.claude_cmd.get_tasks_root")
-    def test_install_handles_unknown_task(
-        self, mock_tasks_root, mock_int_root, cli_runner, mock_assist_path
-    ):
-        """Test that install command handles unknown task gracefully."""
-        mock_tasks_root.return_value = mock_assist_path / "tasks"
-        mock_int_root.return_value = mock_assist_path / "integrations"
+        # Create existing installation
+        skill_dir.mkdir(parents=True)
+        (skill_dir / "SKILL.md").write_text("old content")
+
+        result = cli_runner.invoke(install_skill, ["migrate", "--force"])
 
+        assert result.exit_code == 0
+        assert "Installed" in result.output
+        # Content should be updated
+        assert (skill_dir / "SKILL.md").read_bytes() == _MIGRATE_SKILL_BYTES
+
+    def test_install_handles_unknown_task(self, cli_runner):
+        """Test that install command handles unknown task gracefully."""
         result = cli_runner.invoke(install_skill, ["nonexistent-task"])
 
         assert result.exit_code == 0  # Doesn't crash
         assert "not found" in result.output.lower()
 
-    @patch("osprey.cli.claude_cmd.get_integrations_root")
-    @patch("osprey.cli.claude_cmd.get_tasks_root")
-    def test_install_handles_task_without_integration(
-        self, mock_tasks_root, mock_int_root, cli_runner, mock_assist_path, tmp_path
-    ):
+    def test_install_handles_task_without_integration(self, cli_runner):
         """Test that install warns when task has no Claude integration."""
-        mock_tasks_root.return_value = mock_assist_path / "tasks"
-        mock_int_root.return_value = mock_assist_path / "integrations"
+        # testing-workflow has no claude_code integration
+        result = cli_runner.invoke(install_skill, ["testing-workflow"])
 
-        with cli_runner.isolated_filesystem(temp_dir=tmp_path):
-            # testing-workflow has no claude_code integration
-            result = cli_runner.invoke(install_skill, ["testing-workflow"])
-
-            assert result.exit_code == 0
-            assert "No Claude Code skill available" in result.output
+        assert result.exit_code == 0
+        assert "No Claude Code skill available" in result.output
 
-    @patch("osprey.cli.claude_cmd.get_integrations_root")
-    @patch("osprey.cli.claude_cmd.get_tasks_root")
-    def test_install_shows_usage_hint(
-        self, mock_tasks_root, mock_int_root, cli_runner, mock_assist_path, tmp_path
-    ):
+    def test_install_shows_usage_hint(self, cli_runner):
         """Test that install shows usage hint after success."""
-        mock_tasks_root.return_value = mock_assist_path / "tasks"
-        mock_int_root.return_value = mock_assist_path / "integrations"
+        result = cli_runner.invoke(install_skill, ["pre-commit"])
 
-        with cli_runner.isolated_filesystem(temp_dir=tmp_path):
-            result = cli_runner.invoke(install_skill, ["pre-commit"])
-
-            assert result.exit_code == 0
-            assert "Usage" in result.output
-            assert "Ask Claude" in result.output
+        assert result.exit_code == 0
+        assert "Usage" in result.output
+        assert "Ask Claude" in result.output
 
 
 class TestClaudeListCommand:
     """Test the 'osprey claude list' command."""
 
-    @patch("osprey.cli.claude_cmd.get_integrations_root")
-    @patch("osprey.cli.claude_cmd.get_tasks_root")
     @patch("osprey.cli.claude_cmd.get_claude_skills_dir")
-    def test_list_shows_installed_skills(
-        self,
-        mock_skills_dir,
-        mock_tasks_root,
-        mock_int_root,
-        cli_runner,
-        mock_assist_path,
-        tmp_path,
-    ):
-        """Test that list shows installed skills."""
-        mock_tasks_root.return_value = mock_assist_path / "tasks"
-        mock_int_root.return_value = mock_assist_path / "integrations"
-
-        # Create installed skill
-        skills_dir = tmp_path / ".claude" / "skills"
+    def test_list_shows_expected_output(self, mock_skills_dir, cli_runner, tmp_path):
+        """Test that list shows installed, installable and integration-less tasks."""
+        # Install migrate only
+        skills_dir = tmp_path / _SKILLS_DIR
         skills_dir.mkdir(parents=True)
         (skills_dir / "migrate").mkdir()
         mock_skills_dir.return_value = skills_dir
@@ -280,58 +234,12 @@ class TestClaudeListCommand:
         result = cli_runner.invoke(list_skills)
 
         assert result.exit_code == 0
+        # Installed
         assert "migrate" in result.output
         assert "✓" in result.output
-
-    @patch("osprey.cli.claude_cmd.get_integrations_root")
-    @patch("osprey.cli.claude_cmd.get_tasks_root")
-    @patch("osprey.cli.claude_cmd.get_claude_skills_dir")
-    def test_list_shows_available_to_install(
-        self,
-        mock_skills_dir,
-        mock_tasks_root,
-        mock_int_root,
-        cli_runner,
-        mock_assist_path,
-        tmp_path,
-    ):
-        """Test that list shows skills available to install."""
-        mock_tasks_root.return_value = mock_assist_path / "tasks"
-        mock_int_root.return_value = mock_assist_path / "integrations"
-
-        # No skills installed
-        skills_dir = tmp_path / ".claude" / "skills"
-        mock_skills_dir.return_value = skills_dir
-
-        result = cli_runner.invoke(list_skills)
-
-        assert result.exit_code == 0
+        # Not yet installed
         assert "Available to install" in result.output
-        assert "migrate" in result.output
         assert "pre-commit" in result.output
-
-    @patch("osprey.cli.claude_cmd.get_integrations_root")
-    @patch("osprey.cli.claude_cmd.get_tasks_root")
-    @patch("osprey.cli.claude_cmd.get_claude_skills_dir")
-    def test_list_shows_tasks_without_integration(
-        self,
-        mock_skills_dir,
-        mock_tasks_root,
-        mock_int_root,
-        cli_runner,
-        mock_assist_path,
-        tmp_path,
-    ):
-        """Test that list shows tasks without Claude integration."""
-        mock_tasks_root.return_value = mock_assist_path / "tasks"
-        mock_int_root.return_value = mock_assist_path / "integrations"
-
-        skills_dir = tmp_path / ".claude" / "skills"
-        mock_skills_dir.return_value = skills_dir
-
-        result = cli_runner.invoke(list_skills)
-
-        assert result.exit_code == 0
         # testing-workflow has no integration
         assert "testing-workflow" in result.output
 
@@ -347,17 +255,8 @@ class TestClaudeGroupCommand:
         assert "install" in result.output.lower()
         assert "list" in result.output.lower()
 
-    def test_claude_help_shows_subcommands(self, cli_runner):
-        """Test that help text shows available subcommands."""
-        result = cli_runner.invoke(claude, ["--help"])
-
-        assert result.exit_code == 0
-        assert "install" in result.output.lower()
-        assert "list" in result.output.lower()
-
-    def test_claude_help_mentions_tasks(self, cli_runner):
-        """Test that help text mentions how to browse tasks."""
-        result = cli_runner.invoke(claude, ["--help"])
-
-        assert result.exit_code == 0
-        assert "tasks" in result.output.lower()
+    @pytest.mark.parametrize("needle", ["install", "list", "tasks"])
+    def test_claude_help_contains(self, needle, claude_help_result):
+        """Test that help text shows the subcommands and how to browse tasks."""
+        assert claude_help_result.exit_code == 0
+        assert needle in claude_help_result.output.lower()
@@ -8,39 +8,69 @@ These tests verify that:
 No API keys required - these are pure structural validation tests.
 """
 
+import os
 import re
 from pathlib import Path
-from unittest.mock import patch
+from types import SimpleNamespace
 
 import pytest
-import yaml
+from click.testing import CliRunner
 
 from osprey.cli.claude_cmd import install_skill
 from osprey.cli.tasks_cmd import get_integrations_root, get_tasks_root
 
+# Where install_skill puts a task's skill, relative to the install root
+_SKILL_DIR_TMPL = ".claude/skills/{task}"
+_FRONTMATTER_RE = re.compile(rb"^---\n(.*?)\n---", re.DOTALL)
+_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
+
+
+def _subdirs(root: Path) -> tuple[Path, ...]:
+    """List the subdirectories of root using the directory entry type, without a stat each."""
+    with os.scandir(root) as entries:
+        return tuple(Path(entry.path) for entry in entries if entry.is_dir(follow_symlinks=False))
+
+
+@pytest.fixture(scope="session")
+def skill_inventory():
+    """Collect the bundled skill files, skill directories and task directories once."""
+    integrations_root = get_integrations_root()
+    tasks_root = get_tasks_root()
+    claude_code_dir = integrations_root / "claude_code"
+    has_claude_code = claude_code_dir.exists()
+    has_tasks = tasks_root.exists()
+    return SimpleNamespace(
+        integrations_root=integrations_root,
+        tasks_root=tasks_root,
+        has_claude_code=has_claude_code,
+        has_tasks=has_tasks,
+        skill_files=tuple(claude_code_dir.glob("*/SKILL.md")) if has_claude_code else (),
+        skill_dirs=_subdirs(claude_code_dir) if has_claude_code else (),
+        task_dirs=_subdirs(tasks_root) if has_tasks else (),
+    )
+
 
 class TestSkillFileStructure:
     """Test that all bundled skill files have valid structure."""
 
-    def test_all_skill_files_have_valid_yaml_frontmatter(self):
+    def test_all_skill_files_have_valid_yaml_frontmatter(self, skill_inventory):
         """Verify all SKILL.md files in integrations have valid YAML frontmatter."""
-        integrations_root = get_integrations_root()
-        claude_code_dir = integrations_root / "claude_code"
+        import yaml
 
-        if not claude_code_dir.exists():
+        if not skill_inventory.has_claude_code:
             pytest.skip("No claude_code integrations directory found")
 
-        skill_files = list(claude_code_dir.glob("*/SKILL.md"))
+        skill_files = skill_inventory.skill_files
         assert len(skill_files) > 0, "No SKILL.md files found"
 
         for skill_file in skill_files:
-            content = skill_file.read_text()
+            content = skill_file.read_bytes()
 
             # Check for YAML frontmatter
-            assert content.startswith("---"), f"{skill_file} missing YAML frontmatter start"
+            assert content.startswith(b"---"), f"{skill_file} missing YAML frontmatter start"
 
             # Extract frontmatter
-            match = re.match(r"^---\n(.*?)\n---", content, re.DOTALL)
+            match = _FRONTMATTER_RE.match(content)
             assert match, f"{skill_file} has malformed YAML frontmatter"
 
             # Parse YAML
@@ -53,18 +83,14 @@ class TestSkillFileStructure:
                 f"{skill_file} name should start with 'osprey-'"
             )
 
-    def test_all_skills_have_corresponding_task(self):
+    def test_all_skills_have_corresponding_task(self, skill_inventory):
         """Verify every skill has a corresponding task with instructions.md."""
-        integrations_root = get_integrations_root()
-        tasks_root = get_tasks_root()
-        claude_code_dir = integrations_root / "claude_code"
+        tasks_root = skill_inventory.tasks_root
 
-        if not claude_code_dir.exists():
+        if not skill_inventory.has_claude_code:
             pytest.skip("No claude_code integrations directory found")
 
-        skill_dirs = [d for d in claude_code_dir.iterdir() if d.is_dir()]
-
-        for skill_dir in skill_dirs:
+        for skill_dir in skill_inventory.skill_dirs:
             task_name = skill_dir.name
             task_dir = tasks_root / task_name
 
@@ -79,125 +105,104 @@ class TestSkillFileStructure:
                 f"Task '{task_name}' missing instructions.md at {instructions_file}"
             )
 
-    def test_all_tasks_have_instructions(self):
+    def test_all_tasks_have_instructions(self, skill_inventory):
         """Verify all task directories have an instructions.md file."""
-        tasks_root = get_tasks_root()
-
-        if not tasks_root.exists():
+        if not skill_inventory.has_tasks:
             pytest.skip("Tasks root directory not found")
 
-        task_dirs = [d for d in tasks_root.iterdir() if d.is_dir()]
+        task_dirs = skill_inventory.task_dirs
         assert len(task_dirs) > 0, "No task directories found"
 
         for task_dir in task_dirs:
-            instructions_file = task_dir / "instructions.md"
-            assert instructions_file.exists(), f"Task '{task_dir.name}' missing instructions.md"
+            # Reading doubles as the existence check; no separate stat
+            try:
+                content = (task_dir / "instructions.md").read_text()
+            except FileNotFoundError:
+                pytest.fail(f"Task '{task_dir.name}' missing instructions.md")
 
             # Verify it's not empty
-            content = instructions_file.read_text()
             assert len(content.strip()) > 100, (
                 f"Task '{task_dir.name}' instructions.md appears empty or too short"
             )
 
 
-class TestSkillInstallation:
-    """Test that skill installation produces valid files."""
-
-    def test_installed_skill_has_valid_structure(self, cli_runner, tmp_path):
-        """Test that an installed skill has all required files."""
-        integrations_root = get_integrations_root()
-        tasks_root = get_tasks_root()
-
-        # Find a skill that has a Claude integration
-        claude_code_dir = integrations_root / "claude_code"
-        if not claude_code_dir.exists():
-            pytest.skip("No claude_code integrations available")
-
-        skill_dirs = [d for d in claude_code_dir.iterdir() if d.is_dir()]
-        if not skill_dirs:
-            pytest.skip("No skills available to install")
-
-        task_name = skill_dirs[0].name
-
-        # Use isolated_filesystem to change cwd to temp directory
-        with cli_runner.isolated_filesystem(temp_dir=tmp_path):
-            with patch("osprey.cli.claude_cmd.get_tasks_root") as mock_tasks:
-                mock_tasks.return_value = tasks_root
-                with patch("osprey.cli.claude_cmd.get_integrations_root") as mock_int:
-                    mock_int.return_value = integrations_root
-
-                    result = cli_runner.invoke(install_skill, [task_name])
-                    assert result.exit_code == 0, f"Install failed: {result.output}"
-
-            # Verify installed structure (cwd is now the temp directory)
-            installed_dir = Path(".claude") / "skills" / task_name
-            assert installed_dir.exists(), "Skill directory not created"
-
-            skill_file = installed_dir / "SKILL.md"
-            assert skill_file.exists(), "SKILL.md not copied"
+@pytest.fixture(scope="session")
+def cli_runner():
+    """Provide a Click CLI test runner shared by the session; no test reconfigures it."""
+    return CliRunner()
 
-            instructions_file = installed_dir / "instructions.md"
-            assert instructions_file.exists(), "instructions.md not copied"
 
-            # Verify SKILL.md content
-            skill_content = skill_file.read_text()
-            assert "---" in skill_content, "SKILL.md missing frontmatter"
+@pytest.fixture(scope="module")
+def installed_skill(tmp_path_factory, skill_inventory, cli_runner):
+    """Install the first bundled skill once under a temp root for the installation tests."""
+    if not skill_inventory.has_claude_code:
+        pytest.skip("No claude_code integrations available")
+    if not skill_inventory.skill_dirs:
+        pytest.skip("No skills available to install")
 
-    def test_installed_skill_references_are_valid(self, cli_runner, tmp_path):
-        """Test that installed skill file references point to existing files."""
-        integrations_root = get_integrations_root()
-        tasks_root = get_tasks_root()
+    task_name = skill_inventory.skill_dirs[0].name
+    install_root = tmp_path_factory.mktemp("installed_skill")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("osprey.cli.claude_cmd.get_tasks_root", lambda: skill_inventory.tasks_root)
+        mp.setattr(
+            "osprey.cli.claude_cmd.get_integrations_root",
+            lambda: skill_inventory.integrations_root,
+        )
+        mp.setattr("osprey.cli.claude_cmd._get_install_root", lambda: install_root)
+        result = cli_runner.invoke(install_skill, [task_name])
 
-        claude_code_dir = integrations_root / "claude_code"
-        if not claude_code_dir.exists():
-            pytest.skip("No claude_code integrations available")
+    return SimpleNamespace(
+        result=result, installed_dir=install_root / _SKILL_DIR_TMPL.format(task=task_name)
+    )
 
-        skill_dirs = [d for d in claude_code_dir.iterdir() if d.is_dir()]
-        if not skill_dirs:
-            pytest.skip("No skills available to install")
 
-        task_name = skill_dirs[0].name
+class TestSkillInstallation:
+    """Test that skill installation produces valid files."""
 
-        with cli_runner.isolated_filesystem(temp_dir=tmp_path):
-            with patch("osprey.cli.claude_cmd.get_tasks_root") as mock_tasks:
-                mock_tasks.return_value = tasks_root
-                with patch("osprey.cli.claude_cmd.get_integrations_root") as mock_int:
-                    mock_int.return_value = integrations_root
+    def test_installed_skill_has_valid_structure(self, installed_skill):
+        """Test that an installed skill has all required files."""
+        result = installed_skill.result
+        assert result.exit_code == 0, f"Install failed: {result.output}"
 
-                    cli_runner.invoke(install_skill, [task_name])
+        # Verify installed structure
+        installed_dir = installed_skill.installed_dir
+        assert installed_dir.exists(), "Skill directory not created"
 
-            installed_dir = Path(".claude") / "skills" / task_name
+        skill_file = installed_dir / "SKILL.md"
+        assert skill_file.exists(), "SKILL.md not copied"
 
-            # Check for markdown links in SKILL.md
-            skill_content = (installed_dir / "SKILL.md").read_text()
+        instructions_file = installed_dir / "instructions.md"
+        assert instructions_file.exists(), "instructions.md not copied"
 
-            # Find markdown links like [text](path)
-            link_pattern = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
-            links = link_pattern.findall(skill_content)
+        # Verify SKILL.md content
+        skill_content = skill_file.read_text()
+        assert "---" in skill_content, "SKILL.md missing frontmatter"
 
-            for _link_text, link_path in links:
-                # Skip external URLs
-                if link_path.startswith(("http://", "https://", "#")):
-                    continue
+    def test_installed_skill_references_are_valid(self, installed_skill):
+        """Test that installed skill file references point to existing files."""
+        installed_dir = installed_skill.installed_dir
 
-                # Resolve relative path from installed directory
-                if link_path.startswith("../"):
-                    # These are references back to the source - skip for installed skills
-                    continue
+        # Check for markdown links in SKILL.md
+        skill_content = (installed_dir / "SKILL.md").read_text()
 
-                # Local file references should exist
-                referenced_file = installed_dir / link_path
-                if not referenced_file.exists():
-                    # Try without leading ./
-                    referenced_file = installed_dir / link_path.lstrip("./")
+        # Find markdown links like [text](path)
+        links = _LINK_RE.findall(skill_content)
 
-                # Note: We don't assert here because SKILL.md may reference
-                # files in the source tree, not the installed location
+        for _link_text, link_path in links:
+            # Skip external URLs
+            if link_path.startswith(("http://", "https://", "#")):
+                continue
 
+            # Resolve relative path from installed directory
+            if link_path.startswith("../"):
+                # These are references back to the source - skip for installed skills
+                continue
 
-@pytest.fixture
-def cli_runner():
-    """Provide a Click CLI test runner."""
-    from click.testing import CliRunner
+            # Local file references should exist
+            referenced_file = installed_dir / link_path
+            if not referenced_file.exists():
+                # Try without leading ./
+                referenced_file = installed_dir / link_path.lstrip("./")
 
-    return CliRunner()
+            # Note: We don't assert here because SKILL.md may reference
+            # files in the source tree, not the installed location
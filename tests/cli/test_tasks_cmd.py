@@ -4,7 +4,12 @@ This test module verifies that the task browsing commands work correctly,
 including listing tasks, utility functions, and editor/clipboard detection.
 """
 
+import io
+import re
+from contextlib import redirect_stdout
+from itertools import pairwise
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -24,68 +29,70 @@ from osprey.cli.tasks_cmd import (
     tasks,
 )
 
+# Task names and headings 'osprey tasks list' must show, matched in one pass over the output
+_LIST_EXPECTED = re.compile(r"migrate|pre-commit|testing-workflow|Available Tasks")
 
-@pytest.fixture
+# Mock task file contents, pre-encoded for write_bytes
+_MIGRATE_INSTRUCTIONS_BYTES = (
+    b"# Migration Assistant\n\nUpgrade downstream projects to newer OSPREY versions.\n\n"
+    b"## Steps\n..."
+)
+_PRECOMMIT_INSTRUCTIONS_BYTES = b"# Pre-Commit Validation\n\nValidate code before committing.\n"
+_TESTING_INSTRUCTIONS_BYTES = (
+    b"---\nworkflow: testing\n---\n\n# Testing Workflow\n\nComprehensive testing guide.\n"
+)
+_COMMENTS_INSTRUCTIONS_BYTES = b"# Comments Guidelines\n\nWrite purposeful inline comments.\n"
+
+# Mock tasks tree:
+# - incomplete-task has no instructions.md and must be ignored
+# - comments has no skill_description, for the no-integration case
+# - only migrate and pre-commit have Claude Code integrations
+_MOCK_TASKS_LAYOUT = (
+    ("tasks/migrate/instructions.md", _MIGRATE_INSTRUCTIONS_BYTES),
+    ("tasks/pre-commit/instructions.md", _PRECOMMIT_INSTRUCTIONS_BYTES),
+    ("tasks/testing-workflow/instructions.md", _TESTING_INSTRUCTIONS_BYTES),
+    ("tasks/incomplete-task/notes.txt", b"This task has no instructions.md"),
+    ("tasks/comments/instructions.md", _COMMENTS_INSTRUCTIONS_BYTES),
+    ("integrations/claude_code/migrate/SKILL.md", b"# Migrate Skill\n"),
+    ("integrations/claude_code/pre-commit/SKILL.md", b"# Pre-commit Skill\n"),
+)
+
+
+@pytest.fixture(scope="session")
 def cli_runner():
-    """Provide a Click CLI test runner."""
+    """Provide a Click CLI test runner shared by the session; no test reconfigures it."""
     return CliRunner()
 
 
-@pytest.fixture
-def mock_tasks_path(tmp_path):
-    """Create a mock tasks directory with sample task files."""
-    # Create tasks directory
-    tasks_dir = tmp_path / "tasks"
-    tasks_dir.mkdir()
-
-    # Create migrate task
-    migrate_dir = tasks_dir / "migrate"
-    migrate_dir.mkdir()
-    (migrate_dir / "instructions.md").write_text(
-        "# Migration Assistant\n\nUpgrade downstream projects to newer OSPREY versions.\n\n## Steps\n..."
-    )
-
-    # Create pre-commit task
-    precommit_dir = tasks_dir / "pre-commit"
-    precommit_dir.mkdir()
-    (precommit_dir / "instructions.md").write_text(
-        "# Pre-Commit Validation\n\nValidate code before committing.\n"
-    )
+def _write_mock_tasks_tree(root: Path) -> Path:
+    """Write sample task and integration files under root."""
+    for relpath, data in _MOCK_TASKS_LAYOUT:
+        path = root / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
 
-    # Create testing-workflow task with frontmatter
-    testing_dir = tasks_dir / "testing-workflow"
-    testing_dir.mkdir()
-    (testing_dir / "instructions.md").write_text(
-        "---\nworkflow: testing\n---\n\n# Testing Workflow\n\nComprehensive testing guide.\n"
-    )
+    return root
 
-    # Create a task without instructions.md (should be ignored)
-    incomplete_dir = tasks_dir / "incomplete-task"
-    incomplete_dir.mkdir()
-    (incomplete_dir / "notes.txt").write_text("This task has no instructions.md")
 
-    # Create comments task (no skill_description, for testing no-integration case)
-    comments_dir = tasks_dir / "comments"
-    comments_dir.mkdir()
-    (comments_dir / "instructions.md").write_text(
-        "# Comments Guidelines\n\nWrite purposeful inline comments.\n"
-    )
+@pytest.fixture(scope="session")
+def mock_tasks_path(tmp_path_factory):
+    """Create a mock tasks directory with sample task files.
 
-    # Create integrations directory
-    integrations_dir = tmp_path / "integrations"
-    integrations_dir.mkdir()
+    Session-scoped: tests only read this tree. Returns the tree root together
+    with its precomputed tasks and integrations subdirectories.
+    """
+    root = _write_mock_tasks_tree(tmp_path_factory.mktemp("mock_tasks"))
+    return SimpleNamespace(root=root, tasks=root / "tasks", integrations=root / "integrations")
 
-    # Create claude_code integration for migrate and pre-commit (with SKILL.md files)
-    claude_code_dir = integrations_dir / "claude_code"
-    claude_code_dir.mkdir()
-    migrate_int_dir = claude_code_dir / "migrate"
-    migrate_int_dir.mkdir()
-    (migrate_int_dir / "SKILL.md").write_text("# Migrate Skill\n")
-    precommit_int_dir = claude_code_dir / "pre-commit"
-    precommit_int_dir.mkdir()
-    (precommit_int_dir / "SKILL.md").write_text("# Pre-commit Skill\n")
 
-    return tmp_path
+@pytest.fixture
+def patched_roots(monkeypatch, mock_tasks_path):
+    """Point the tasks command at the mock tasks tree and return its paths."""
+    monkeypatch.setattr("osprey.cli.tasks_cmd.get_tasks_root", lambda: mock_tasks_path.tasks)
+    monkeypatch.setattr(
+        "osprey.cli.tasks_cmd.get_integrations_root", lambda: mock_tasks_path.integrations
+    )
+    return mock_tasks_path
 
 
 class TestGetTasksRoot:
@@ -105,11 +112,8 @@ class TestGetTasksRoot:
 class TestGetAvailableTasks:
     """Test the get_available_tasks() function."""
 
-    @patch("osprey.cli.tasks_cmd.get_tasks_root")
-    def test_returns_list_of_tasks(self, mock_root, mock_tasks_path):
+    def test_returns_list_of_tasks(self, patched_roots):
         """Test that function returns list of task directory names."""
-        mock_root.return_value = mock_tasks_path / "tasks"
-
         result = get_available_tasks()
 
         assert isinstance(result, list)
@@ -119,42 +123,36 @@ class TestGetAvailableTasks:
         # incomplete-task should not be included (no instructions.md)
         assert "incomplete-task" not in result
 
-    @patch("osprey.cli.tasks_cmd.get_tasks_root")
-    def test_returns_empty_list_when_no_tasks_dir(self, mock_root, tmp_path):
+    def test_returns_empty_list_when_no_tasks_dir(self, monkeypatch, tmp_path):
         """Test that function returns empty list when tasks directory doesn't exist."""
-        mock_root.return_value = tmp_path / "nonexistent"
+        monkeypatch.setattr("osprey.cli.tasks_cmd.get_tasks_root", lambda: tmp_path / "nonexistent")
 
         result = get_available_tasks()
 
         assert result == []
 
-    @patch("osprey.cli.tasks_cmd.get_tasks_root")
-    def test_returns_sorted_list(self, mock_root, mock_tasks_path):
+    def test_returns_sorted_list(self, patched_roots):
         """Test that tasks are returned in sorted order."""
-        mock_root.return_value = mock_tasks_path / "tasks"
-
         result = get_available_tasks()
 
-        assert result == sorted(result)
+        assert all(a <= b for a, b in pairwise(result))
 
 
 class TestGetAvailableIntegrations:
     """Test the get_available_integrations() function."""
 
-    @patch("osprey.cli.tasks_cmd.get_integrations_root")
-    def test_returns_list_of_integrations(self, mock_root, mock_tasks_path):
+    def test_returns_list_of_integrations(self, patched_roots):
         """Test that function returns list of integration directory names."""
-        mock_root.return_value = mock_tasks_path / "integrations"
-
         result = get_available_integrations()
 
         assert isinstance(result, list)
         assert "claude_code" in result
 
-    @patch("osprey.cli.tasks_cmd.get_integrations_root")
-    def test_returns_empty_list_when_no_integrations_dir(self, mock_root, tmp_path):
+    def test_returns_empty_list_when_no_integrations_dir(self, monkeypatch, tmp_path):
         """Test that function returns empty list when integrations directory doesn't exist."""
-        mock_root.return_value = tmp_path / "nonexistent"
+        monkeypatch.setattr(
+            "osprey.cli.tasks_cmd.get_integrations_root", lambda: tmp_path / "nonexistent"
+        )
 
         result = get_available_integrations()
 
@@ -164,29 +162,22 @@ class TestGetAvailableIntegrations:
 class TestGetTaskDescription:
     """Test the get_task_description() function."""
 
-    @patch("osprey.cli.tasks_cmd.get_tasks_root")
-    def test_returns_first_content_line(self, mock_root, mock_tasks_path):
+    def test_returns_first_content_line(self, patched_roots):
         """Test that function returns the first non-header line."""
-        mock_root.return_value = mock_tasks_path / "tasks"
-
         result = get_task_description("migrate")
 
         assert "Upgrade downstream" in result
 
-    @patch("osprey.cli.tasks_cmd.get_tasks_root")
-    def test_skips_frontmatter(self, mock_root, mock_tasks_path):
+    def test_skips_frontmatter(self, patched_roots):
         """Test that function skips YAML frontmatter."""
-        mock_root.return_value = mock_tasks_path / "tasks"
-
         result = get_task_description("testing-workflow")
 
         # Should skip frontmatter and return first content line after headers
         assert "Comprehensive testing guide" in result
 
-    @patch("osprey.cli.tasks_cmd.get_tasks_root")
-    def test_returns_empty_for_nonexistent(self, mock_root, tmp_path):
+    def test_returns_empty_for_nonexistent(self, monkeypatch, tmp_path):
         """Test that function returns empty string for nonexistent task."""
-        mock_root.return_value = tmp_path / "tasks"
+        monkeypatch.setattr("osprey.cli.tasks_cmd.get_tasks_root", lambda: tmp_path / "tasks")
 
         result = get_task_description("nonexistent")
 
@@ -196,34 +187,26 @@ class TestGetTaskDescription:
 class TestHasClaudeIntegration:
     """Test the has_claude_integration() function."""
 
-    @patch("osprey.cli.claude_cmd.can_generate_skill")
-    @patch("osprey.cli.tasks_cmd.get_integrations_root")
-    def test_returns_true_when_custom_wrapper_exists(
-        self, mock_root, mock_can_gen, mock_tasks_path
-    ):
+    def test_returns_true_when_custom_wrapper_exists(self, monkeypatch, patched_roots):
         """Test that function returns True when custom Claude integration exists."""
-        mock_root.return_value = mock_tasks_path / "integrations"
-        mock_can_gen.return_value = False  # No auto-generation
+        # No auto-generation
+        monkeypatch.setattr("osprey.cli.claude_cmd.can_generate_skill", lambda task: False)
 
         assert has_claude_integration("migrate") is True
         assert has_claude_integration("pre-commit") is True
 
-    @patch("osprey.cli.claude_cmd.can_generate_skill")
-    @patch("osprey.cli.tasks_cmd.get_integrations_root")
-    def test_returns_true_when_auto_generatable(self, mock_root, mock_can_gen, mock_tasks_path):
+    def test_returns_true_when_auto_generatable(self, monkeypatch, patched_roots):
         """Test that function returns True when task has skill_description."""
-        mock_root.return_value = mock_tasks_path / "integrations"
-        mock_can_gen.return_value = True  # Has skill_description
+        # Has skill_description
+        monkeypatch.setattr("osprey.cli.claude_cmd.can_generate_skill", lambda task: True)
 
         # testing-workflow has no custom wrapper but can be auto-generated
         assert has_claude_integration("testing-workflow") is True
 
-    @patch("osprey.cli.claude_cmd.can_generate_skill")
-    @patch("osprey.cli.tasks_cmd.get_integrations_root")
-    def test_returns_false_when_no_integration(self, mock_root, mock_can_gen, mock_tasks_path):
+    def test_returns_false_when_no_integration(self, monkeypatch, patched_roots):
         """Test that function returns False when no Claude integration."""
-        mock_root.return_value = mock_tasks_path / "integrations"
-        mock_can_gen.return_value = False  # No auto-generation
+        # No auto-generation
+        monkeypatch.setattr("osprey.cli.claude_cmd.can_generate_skill", lambda task: False)
 
         # comments has no custom wrapper and no skill_description
         assert has_claude_integration("comments") is False
@@ -232,24 +215,18 @@ class TestHasClaudeIntegration:
 class TestGetInstructionsPath:
     """Test the get_instructions_path() function."""
 
-    @patch("osprey.cli.tasks_cmd.get_tasks_root")
-    def test_returns_correct_path(self, mock_root, mock_tasks_path):
+    def test_returns_correct_path(self, patched_roots):
         """Test that function returns correct instructions path."""
-        mock_root.return_value = mock_tasks_path / "tasks"
-
         result = get_instructions_path("migrate")
 
-        assert result == mock_tasks_path / "tasks" / "migrate" / "instructions.md"
+        assert result == patched_roots.tasks / "migrate" / "instructions.md"
 
 
 class TestGetAtmentionPath:
     """Test the get_atmention_path() function."""
 
-    @patch("osprey.cli.tasks_cmd.get_tasks_root")
-    def test_returns_atmention_format(self, mock_root, mock_tasks_path):
+    def test_returns_atmention_format(self, patched_roots):
         """Test that function returns @-prefixed path."""
-        mock_root.return_value = mock_tasks_path / "tasks"
-
         result = get_atmention_path("migrate")
 
         assert result.startswith("@")
@@ -259,38 +236,34 @@ class TestGetAtmentionPath:
 class TestDetectEditor:
     """Test the detect_editor() function."""
 
-    @patch("shutil.which")
-    def test_detects_cursor(self, mock_which):
+    def test_detects_cursor(self, monkeypatch):
         """Test that function detects Cursor editor."""
-        mock_which.side_effect = lambda cmd: cmd == "cursor"
+        monkeypatch.setattr("osprey.cli.tasks_cmd._command_exists", lambda cmd: cmd == "cursor")
 
         result = detect_editor()
 
         assert result == ("cursor", "Cursor")
 
-    @patch("shutil.which")
-    def test_detects_vscode(self, mock_which):
+    def test_detects_vscode(self, monkeypatch):
         """Test that function detects VS Code editor."""
-        mock_which.side_effect = lambda cmd: cmd == "code"
+        monkeypatch.setattr("osprey.cli.tasks_cmd._command_exists", lambda cmd: cmd == "code")
 
         result = detect_editor()
 
         assert result == ("code", "VS Code")
 
-    @patch("shutil.which")
     @patch.dict("os.environ", {"EDITOR": "vim"})
-    def test_falls_back_to_editor_env(self, mock_which):
+    def test_falls_back_to_editor_env(self, monkeypatch):
         """Test that function falls back to $EDITOR."""
-        mock_which.side_effect = lambda cmd: cmd == "vim"
+        monkeypatch.setattr("osprey.cli.tasks_cmd._command_exists", lambda cmd: cmd == "vim")
 
         result = detect_editor()
 
         assert result == ("vim", "vim")
 
-    @patch("shutil.which")
-    def test_returns_none_when_no_editor(self, mock_which):
+    def test_returns_none_when_no_editor(self, monkeypatch):
         """Test that function returns None when no editor found."""
-        mock_which.return_value = None
+        monkeypatch.setattr("osprey.cli.tasks_cmd._command_exists", lambda cmd: False)
 
         result = detect_editor()
 
@@ -328,110 +301,83 @@ class TestCopyToClipboard:
 class TestTasksListCommand:
     """Test the 'osprey tasks list' command."""
 
-    @patch("osprey.cli.tasks_cmd.get_integrations_root")
-    @patch("osprey.cli.tasks_cmd.get_tasks_root")
-    def test_list_shows_available_tasks(
-        self, mock_tasks_root, mock_int_root, cli_runner, mock_tasks_path
-    ):
+    @pytest.fixture(scope="class")
+    def list_output(self, mock_tasks_path):
+        """Run 'osprey tasks list' once against the mock tree for the read-only tests.
+
+        Calls the command callback directly; these tests only check the printed text.
+        """
+        buf = io.StringIO()
+        with (
+            patch("osprey.cli.tasks_cmd.get_tasks_root", return_value=mock_tasks_path.tasks),
+            patch(
+                "osprey.cli.tasks_cmd.get_integrations_root",
+                return_value=mock_tasks_path.integrations,
+            ),
+            redirect_stdout(buf),
+        ):
+            list_tasks.callback()
+        return buf.getvalue()
+
+    def test_list_shows_available_tasks(self, list_output):
         """Test that list command displays available tasks."""
-        mock_tasks_root.return_value = mock_tasks_path / "tasks"
-        mock_int_root.return_value = mock_tasks_path / "integrations"
-
-        result = cli_runner.invoke(list_tasks)
-
-        assert result.exit_code == 0
-        assert "migrate" in result.output
-        assert "pre-commit" in result.output
-        assert "testing-workflow" in result.output
-        assert "Available Tasks" in result.output
-
-    @patch("osprey.cli.tasks_cmd.get_integrations_root")
-    @patch("osprey.cli.tasks_cmd.get_tasks_root")
-    def test_list_shows_task_descriptions(
-        self, mock_tasks_root, mock_int_root, cli_runner, mock_tasks_path
-    ):
+        assert set(_LIST_EXPECTED.findall(list_output)) >= {
+            "migrate",
+            "pre-commit",
+            "testing-workflow",
+            "Available Tasks",
+        }
+
+    def test_list_shows_task_descriptions(self, list_output):
         """Test that list command shows task descriptions."""
-        mock_tasks_root.return_value = mock_tasks_path / "tasks"
-        mock_int_root.return_value = mock_tasks_path / "integrations"
-
-        result = cli_runner.invoke(list_tasks)
-
-        assert result.exit_code == 0
         # Should show first non-header line from instructions.md
-        assert (
-            "Upgrade downstream projects" in result.output or "downstream" in result.output.lower()
-        )
+        assert "Upgrade downstream projects" in list_output or "downstream" in list_output.lower()
 
-    @patch("osprey.cli.tasks_cmd.get_integrations_root")
-    @patch("osprey.cli.tasks_cmd.get_tasks_root")
-    def test_list_shows_integrations(
-        self, mock_tasks_root, mock_int_root, cli_runner, mock_tasks_path
-    ):
+    def test_list_shows_integrations(self, list_output):
         """Test that list command shows available integrations."""
-        mock_tasks_root.return_value = mock_tasks_path / "tasks"
-        mock_int_root.return_value = mock_tasks_path / "integrations"
-
-        result = cli_runner.invoke(list_tasks)
-
-        assert result.exit_code == 0
-        assert "Claude Code" in result.output
+        assert "Claude Code" in list_output
 
-    @patch("osprey.cli.tasks_cmd.get_integrations_root")
-    @patch("osprey.cli.tasks_cmd.get_tasks_root")
-    def test_list_handles_no_tasks(self, mock_tasks_root, mock_int_root, cli_runner, tmp_path):
+    def test_list_handles_no_tasks(self, monkeypatch, capsys, tmp_path):
         """Test that list command handles case when no tasks exist."""
         empty_tasks = tmp_path / "tasks"
         empty_tasks.mkdir()
-        mock_tasks_root.return_value = empty_tasks
-        mock_int_root.return_value = tmp_path / "integrations"
+        monkeypatch.setattr("osprey.cli.tasks_cmd.get_tasks_root", lambda: empty_tasks)
+        monkeypatch.setattr(
+            "osprey.cli.tasks_cmd.get_integrations_root", lambda: tmp_path / "integrations"
+        )
 
-        result = cli_runner.invoke(list_tasks)
+        list_tasks.callback()
 
-        assert result.exit_code == 0
-        assert "No tasks available" in result.output
+        assert "No tasks available" in capsys.readouterr().out
 
-    @patch("osprey.cli.tasks_cmd.get_integrations_root")
-    @patch("osprey.cli.tasks_cmd.get_tasks_root")
-    def test_list_shows_paths(self, mock_tasks_root, mock_int_root, cli_runner, mock_tasks_path):
+    def test_list_shows_paths(self, list_output):
         """Test that list command shows file paths for @-mentioning."""
-        mock_tasks_root.return_value = mock_tasks_path / "tasks"
-        mock_int_root.return_value = mock_tasks_path / "integrations"
-
-        result = cli_runner.invoke(list_tasks)
-
-        assert result.exit_code == 0
-        assert "instructions.md" in result.output
+        assert "instructions.md" in list_output
 
 
 class TestTasksGroupCommand:
     """Test the main 'osprey tasks' command group."""
 
     @patch("osprey.cli.tasks_cmd.QUESTIONARY_AVAILABLE", False)
-    @patch("osprey.cli.tasks_cmd.get_integrations_root")
-    @patch("osprey.cli.tasks_cmd.get_tasks_root")
-    def test_tasks_without_questionary_falls_back_to_list(
-        self, mock_tasks_root, mock_int_root, cli_runner, mock_tasks_path
-    ):
+    def test_tasks_without_questionary_falls_back_to_list(self, cli_runner, patched_roots):
         """Test that 'osprey tasks' falls back to list when questionary unavailable."""
-        mock_tasks_root.return_value = mock_tasks_path / "tasks"
-        mock_int_root.return_value = mock_tasks_path / "integrations"
-
         result = cli_runner.invoke(tasks)
 
         assert result.exit_code == 0
         # Should show fallback warning and list output
         assert "Available Tasks" in result.output
 
-    def test_tasks_help_shows_subcommands(self, cli_runner):
-        """Test that help text shows available subcommands."""
-        result = cli_runner.invoke(tasks, ["--help"])
+    @pytest.fixture(scope="class")
+    def help_result(self, cli_runner):
+        """Invoke 'osprey tasks --help' once for the help text tests."""
+        return cli_runner.invoke(tasks, ["--help"])
 
-        assert result.exit_code == 0
-        assert "list" in result.output.lower()
+    def test_tasks_help_shows_subcommands(self, help_result):
+        """Test that help text shows available subcommands."""
+        assert help_result.exit_code == 0
+        assert "list" in help_result.output.lower()
 
-    def test_tasks_help_mentions_claude_install(self, cli_runner):
+    def test_tasks_help_mentions_claude_install(self, help_result):
         """Test that help text mentions how to install for Claude."""
-        result = cli_runner.invoke(tasks, ["--help"])
-
-        assert result.exit_code == 0
-        assert "claude" in result.output.lower()
+        assert help_result.exit_code == 0
+        assert "claude" in help_result.output.lower()
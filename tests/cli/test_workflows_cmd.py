@@ -10,23 +10,26 @@ from unittest.mock import patch
 import pytest
 from click.testing import CliRunner
 
+from osprey.cli import workflows_cmd
 from osprey.cli.workflows_cmd import export, get_workflows_source_path, list, workflows
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def cli_runner():
-    """Provide a Click CLI test runner."""
+    """Provide a Click CLI test runner shared by the session; no test reconfigures it."""
     return CliRunner()
 
 
-@pytest.fixture
-def mock_workflows_path(tmp_path):
+@pytest.fixture(scope="session")
+def mock_workflows_path(tmp_path_factory):
     """Create a mock assist/tasks directory with sample task subdirectories.
 
     Note: workflows_cmd now reads from assist/tasks/, not workflows/.
     Each task is a directory with instructions.md inside.
+
+    Session-scoped: tests only read this tree; exports write under tmp_path.
     """
-    tasks_dir = tmp_path / "tasks"
+    tasks_dir = tmp_path_factory.mktemp("mock_workflows") / "tasks"
     tasks_dir.mkdir()
 
     # Create sample task directories with instructions.md files
@@ -45,9 +48,25 @@ def mock_workflows_path(tmp_path):
     return tasks_dir
 
 
+@pytest.fixture
+def patched_source_path(monkeypatch, mock_workflows_path):
+    """Point the workflows command at the mock tasks tree."""
+    monkeypatch.setattr(
+        "osprey.cli.workflows_cmd.get_workflows_source_path", lambda: mock_workflows_path
+    )
+    return mock_workflows_path
+
+
 class TestGetWorkflowsSourcePath:
     """Test the get_workflows_source_path() utility function."""
 
+    @pytest.fixture(autouse=True)
+    def _clear_location_cache(self):
+        """Resolve the tasks directory afresh so patched importlib.resources is used."""
+        workflows_cmd._locate_tasks_dir.cache_clear()
+        yield
+        workflows_cmd._locate_tasks_dir.cache_clear()
+
     def test_returns_path_when_workflows_exist(self):
         """Test that function returns a Path object when workflows directory exists."""
         result = get_workflows_source_path()
@@ -75,51 +94,42 @@ class TestGetWorkflowsSourcePath:
 class TestListCommand:
     """Test the 'osprey workflows list' command."""
 
-    @patch("osprey.cli.workflows_cmd.get_workflows_source_path")
-    def test_list_shows_available_workflows(self, mock_get_path, cli_runner, mock_workflows_path):
+    def test_list_shows_available_workflows(self, capsys, patched_source_path):
         """Test that list command displays available workflow files."""
-        mock_get_path.return_value = mock_workflows_path
+        list.callback()
 
-        result = cli_runner.invoke(list)
-
-        assert result.exit_code == 0
-        assert "testing-workflow.md" in result.output
-        assert "commit-organization.md" in result.output
+        output = capsys.readouterr().out
+        assert "testing-workflow.md" in output
+        assert "commit-organization.md" in output
         # README should be excluded
-        assert "Available AI Workflow Files" in result.output
+        assert "Available AI Workflow Files" in output
 
-    @patch("osprey.cli.workflows_cmd.get_workflows_source_path")
-    def test_list_handles_missing_workflows(self, mock_get_path, cli_runner):
+    def test_list_handles_missing_workflows(self, monkeypatch, capsys):
         """Test that list command shows error when workflows not found."""
-        mock_get_path.return_value = None
+        monkeypatch.setattr("osprey.cli.workflows_cmd.get_workflows_source_path", lambda: None)
 
-        result = cli_runner.invoke(list)
-
-        # Command handles the error gracefully (exit code may be 0 or 1)
         # Main requirement: doesn't crash with exception
-        assert "not found" in result.output.lower() or "error" in result.output.lower()
+        list.callback()
 
-    @patch("osprey.cli.workflows_cmd.get_workflows_source_path")
-    def test_list_shows_workflow_titles(self, mock_get_path, cli_runner, mock_workflows_path):
-        """Test that list command extracts and displays workflow titles."""
-        mock_get_path.return_value = mock_workflows_path
+        output = capsys.readouterr().out.lower()
+        assert "not found" in output or "error" in output
 
-        result = cli_runner.invoke(list)
+    def test_list_shows_workflow_titles(self, capsys, patched_source_path):
+        """Test that list command extracts and displays workflow titles."""
+        list.callback()
 
-        assert result.exit_code == 0
+        output = capsys.readouterr().out
         # Should show extracted titles from markdown headers
-        assert "Testing Workflow" in result.output or "testing-workflow.md" in result.output
+        assert "Testing Workflow" in output or "testing-workflow.md" in output
 
 
 class TestExportCommand:
     """Test the 'osprey workflows export' command."""
 
-    @patch("osprey.cli.workflows_cmd.get_workflows_source_path")
     def test_export_creates_directory_and_copies_files(
-        self, mock_get_path, cli_runner, mock_workflows_path, tmp_path
+        self, cli_runner, patched_source_path, tmp_path
     ):
         """Test that export command creates target directory and copies workflow files."""
-        mock_get_path.return_value = mock_workflows_path
         target = tmp_path / "exported-workflows"
 
         result = cli_runner.invoke(export, ["--output", str(target), "--force"])
@@ -130,13 +140,8 @@ class TestExportCommand:
         assert (target / "testing-workflow.md").exists()
         assert (target / "commit-organization.md").exists()
 
-    @patch("osprey.cli.workflows_cmd.get_workflows_source_path")
-    def test_export_default_location(
-        self, mock_get_path, cli_runner, mock_workflows_path, tmp_path
-    ):
+    def test_export_default_location(self, cli_runner, patched_source_path, tmp_path):
         """Test that export uses default ./osprey-workflows/ location."""
-        mock_get_path.return_value = mock_workflows_path
-
         with cli_runner.isolated_filesystem(temp_dir=tmp_path):
             result = cli_runner.invoke(export, ["--force"])
 
@@ -145,12 +150,8 @@ class TestExportCommand:
             assert Path("osprey-workflows").exists()
             assert (Path("osprey-workflows") / "testing-workflow.md").exists()
 
-    @patch("osprey.cli.workflows_cmd.get_workflows_source_path")
-    def test_export_prompts_when_directory_exists(
-        self, mock_get_path, cli_runner, mock_workflows_path, tmp_path
-    ):
+    def test_export_prompts_when_directory_exists(self, cli_runner, patched_source_path, tmp_path):
         """Test that export prompts for confirmation when directory exists."""
-        mock_get_path.return_value = mock_workflows_path
         target = tmp_path / "existing"
         target.mkdir()
         (target / "existing-file.txt").write_text("existing content")
@@ -161,12 +162,8 @@ class TestExportCommand:
         assert result.exit_code == 0
         assert "Overwrite" in result.output or "cancelled" in result.output.lower()
 
-    @patch("osprey.cli.workflows_cmd.get_workflows_source_path")
-    def test_export_force_skips_prompt(
-        self, mock_get_path, cli_runner, mock_workflows_path, tmp_path
-    ):
+    def test_export_force_skips_prompt(self, cli_runner, patched_source_path, tmp_path):
         """Test that --force flag skips confirmation prompt."""
-        mock_get_path.return_value = mock_workflows_path
         target = tmp_path / "existing"
         target.mkdir()
         (target / "old-file.txt").write_text("old content")
@@ -179,22 +176,17 @@ class TestExportCommand:
         # Workflow files should be copied
         assert (target / "testing-workflow.md").exists()
 
-    @patch("osprey.cli.workflows_cmd.get_workflows_source_path")
-    def test_export_handles_missing_workflows(self, mock_get_path, cli_runner, tmp_path):
+    def test_export_handles_missing_workflows(self, monkeypatch, cli_runner, tmp_path):
         """Test error handling when workflows are not found."""
-        mock_get_path.return_value = None
+        monkeypatch.setattr("osprey.cli.workflows_cmd.get_workflows_source_path", lambda: None)
 
         result = cli_runner.invoke(export, ["--output", str(tmp_path / "target")])
 
         assert result.exit_code == 0  # Should not crash
         assert "not found" in result.output.lower()
 
-    @patch("osprey.cli.workflows_cmd.get_workflows_source_path")
-    def test_export_shows_usage_instructions(
-        self, mock_get_path, cli_runner, mock_workflows_path, tmp_path
-    ):
+    def test_export_shows_usage_instructions(self, cli_runner, patched_source_path, tmp_path):
         """Test that export shows usage examples after successful export."""
-        mock_get_path.return_value = mock_workflows_path
         target = tmp_path / "workflows"
 
         result = cli_runner.invoke(export, ["--output", str(target), "--force"])
@@ -208,12 +200,10 @@ class TestExportCommand:
 class TestWorkflowsGroupCommand:
     """Test the main 'osprey workflows' command group."""
 
-    @patch("osprey.cli.workflows_cmd.get_workflows_source_path")
     def test_workflows_without_subcommand_defaults_to_export(
-        self, mock_get_path, cli_runner, mock_workflows_path, tmp_path
+        self, cli_runner, patched_source_path, tmp_path
     ):
         """Test that 'osprey workflows' without subcommand defaults to export."""
-        mock_get_path.return_value = mock_workflows_path
         target = tmp_path / "test-export"
 
         # Invoke with explicit subcommand instead (testing the group works)
@@ -110,6 +110,42 @@ def fallback_handler_with_capture(captured_events):
 # ===================================================================
 
 
+# Immutable AgentState defaults, built once at import and shared by every
+# create_test_state() call. Mutable containers are created per call instead.
+_DEFAULT_STATE_SCALARS: dict[str, Any] = {
+    "planning_current_step_index": 0,
+    "task_current_task": "Test task",
+    "task_depends_on_chat_history": False,
+    "task_depends_on_user_memory": False,
+    "task_custom_message": None,
+    "execution_last_result": None,
+    "execution_start_time": None,
+    "execution_total_time": None,
+    "approval_approved": None,
+    "approved_payload": None,
+    "control_reclassification_reason": None,
+    "control_reclassification_count": 0,
+    "control_plans_created_count": 1,
+    "control_current_step_retry_count": 0,
+    "control_retry_count": 0,
+    "control_has_error": False,
+    "control_error_info": None,
+    "control_last_error": None,
+    "control_max_retries": 3,
+    "control_is_killed": False,
+    "control_kill_reason": None,
+    "control_is_awaiting_validation": False,
+    "control_validation_context": None,
+    "control_validation_timestamp": None,
+    "ui_agent_context": None,
+    "runtime_checkpoint_metadata": None,
+    "runtime_info": None,
+    "react_step_count": 0,
+    "react_rejection_count": 0,
+    "react_response_generated": False,
+}
+
+
 def create_test_state(
     user_message: str = "test query",
     task_objective: str = "test objective",
@@ -194,56 +230,28 @@ def create_test_state(
         final_objective=final_objective,
     )
 
-    # Create state with defaults
+    # Create state: shared immutable defaults plus fresh containers for this call
     state: AgentState = {
+        **_DEFAULT_STATE_SCALARS,
         "messages": messages,
         "planning_execution_plan": execution_plan,
-        "planning_current_step_index": 0,
         "capability_context_data": {},
         "agent_control": {},
         "status_updates": [],
         "progress_events": [],
-        "task_current_task": "Test task",
-        "task_depends_on_chat_history": False,
-        "task_depends_on_user_memory": False,
-        "task_custom_message": None,
         "planning_active_capabilities": [capability],
         "execution_step_results": {},
-        "execution_last_result": None,
         "execution_pending_approvals": {},
-        "execution_start_time": None,
-        "execution_total_time": None,
-        "approval_approved": None,
-        "approved_payload": None,
-        "control_reclassification_reason": None,
-        "control_reclassification_count": 0,
-        "control_plans_created_count": 1,
-        "control_current_step_retry_count": 0,
-        "control_retry_count": 0,
-        "control_has_error": False,
-        "control_error_info": None,
-        "control_last_error": None,
-        "control_max_retries": 3,
-        "control_is_killed": False,
-        "control_kill_reason": None,
-        "control_is_awaiting_validation": False,
-        "control_validation_context": None,
-        "control_validation_timestamp": None,
         "ui_captured_notebooks": [],
         "ui_captured_figures": [],
         "ui_launchable_commands": [],
-        "ui_agent_context": None,
-        "runtime_checkpoint_metadata": None,
-        "runtime_info": None,
         # Reactive orchestration fields
         "react_messages": [],
-        "react_step_count": 0,
-        "react_rejection_count": 0,
-        "react_response_generated": False,
     }
 
-    # Apply any overrides
-    state.update(overrides)
+    # Apply any overrides; most callers pass none
+    if overrides:
+        state.update(overrides)
 
     return state
 
@@ -267,23 +275,23 @@ class PromptTestHelpers:
         Returns:
             The extracted section content (without the header)
         """
-        lines = prompt.split("\n")
+        header_pos = prompt.find(section_header)
+        if header_pos == -1:
+            return ""
+        # Content starts on the line after the header
+        start = prompt.find("\n", header_pos) + 1
+        if start == 0:
+            return ""
         section_lines = []
-        in_section = False
-
-        for line in lines:
-            if section_header in line:
-                in_section = True
-                continue
-            if in_section:
-                # Stop at next all-caps header with colon
-                if (
-                    line.strip()
-                    and line.strip().replace(" ", "").replace("'", "").isupper()
-                    and ":" in line
-                ):
-                    break
-                section_lines.append(line)
+        for line in prompt[start:].split("\n"):
+            # Stop at next all-caps header with colon
+            if (
+                line.strip()
+                and line.strip().replace(" ", "").replace("'", "").isupper()
+                and ":" in line
+            ):
+                break
+            section_lines.append(line)
 
         return "\n".join(section_lines).strip()
 
@@ -298,13 +306,8 @@ class PromptTestHelpers:
         Returns:
             Dictionary mapping section headers to their positions (-1 if not found)
         """
-        positions = {}
-        for header in section_headers:
-            try:
-                positions[header] = prompt.index(header)
-            except ValueError:
-                positions[header] = -1
-        return positions
+        # str.find already returns -1 for missing headers
+        return {header: prompt.find(header) for header in section_headers}
 
 
 # ===================================================================
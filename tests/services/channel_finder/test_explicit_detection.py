@@ -39,6 +39,7 @@ def mock_database():
     ]
     db.validate_channel = lambda ch: ch in known_channels
     db.get_channel = lambda ch: {"channel": ch, "address": ch} if ch in known_channels else None
+    db.get_channels = lambda chs: {ch: db.get_channel(ch) for ch in chs if ch in known_channels}
     return db
 
 
@@ -170,6 +170,17 @@ def test_middle_layer_database_get_channel(sample_middle_layer_db_path) -> None:
     assert channel["field"] == "Monitor"
 
 
+def test_middle_layer_database_get_channels(sample_middle_layer_db_path) -> None:
+    """Test bulk channel lookup matches per-channel lookup and skips unknown names."""
+    db = MiddleLayerDatabase(sample_middle_layer_db_path)
+
+    names = ["SR01C:BPM1:X", "INVALID:PV", "SR:DCCT:Current"]
+    channels = db.get_channels(names)
+
+    assert list(channels) == ["SR01C:BPM1:X", "SR:DCCT:Current"]
+    assert channels["SR01C:BPM1:X"] == db.get_channel("SR01C:BPM1:X")
+
+
 def test_middle_layer_database_statistics(sample_middle_layer_db_path) -> None:
     """Test database statistics."""
     db = MiddleLayerDatabase(sample_middle_layer_db_path)
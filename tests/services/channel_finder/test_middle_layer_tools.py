@@ -5,6 +5,7 @@ Tests the individual LangChain tools that the React agent uses to query the data
 These tests validate tool behavior without requiring full LLM integration.
 """
 
+import asyncio
 import json
 from unittest.mock import MagicMock
 
@@ -167,6 +168,27 @@ class TestMiddleLayerTools:
         result_empty = report_results_tool.func(channels=[], description="No channels found")
         assert "0 channel(s) found" in result_empty
 
+    def test_tool_results_cached_until_database_reload(self, sample_middle_layer_pipeline) -> None:
+        """Test that read-only tool results are reused until the database reloads."""
+        pipeline = sample_middle_layer_pipeline
+        tools = pipeline._create_tools()
+
+        list_families = next(t for t in tools if t.name == "list_families").func
+        list_channel_names = next(t for t in tools if t.name == "list_channel_names").func
+
+        first = list_families("SR")
+        assert list_families("SR") is first
+
+        unfiltered = list_channel_names("SR", "BPM", "Monitor")
+        assert list_channel_names("SR", "BPM", "Monitor") is unfiltered
+        filtered = list_channel_names("SR", "BPM", "Monitor", sectors=[1])
+        assert filtered != unfiltered
+
+        pipeline.database.load_database()
+        refreshed = list_families("SR")
+        assert refreshed is not first
+        assert refreshed == first
+
 
 class TestMiddleLayerToolIntegration:
     """Test tool interaction patterns that the agent would use."""
@@ -368,6 +390,190 @@ class TestMiddleLayerErrorHandling:
         assert "error" in result
 
 
+class TestMiddleLayerProcessQuery:
+    """Test aggregation of agent results across atomic queries."""
+
+    @staticmethod
+    def _prepare(pipeline, atomic_queries, query_with_agent) -> None:
+        async def detect(query):
+            return MagicMock(has_explicit_addresses=False, reasoning="none")
+
+        async def split(query):
+            return atomic_queries
+
+        pipeline._detect_explicit_channels = detect
+        pipeline._split_query = split
+        pipeline._query_with_agent = query_with_agent
+        pipeline.query_splitting = True
+
+    @pytest.mark.asyncio
+    async def test_atomic_queries_run_concurrently(self, sample_middle_layer_pipeline) -> None:
+        """Test that agent runs overlap and results keep sub-query order."""
+        in_flight = 0
+        max_in_flight = 0
+
+        async def query_with_agent(query):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"channels": [f"{query}:X", "SR:DCCT:Current"], "description": query}
+
+        pipeline = sample_middle_layer_pipeline
+        self._prepare(pipeline, ["A", "B", "C"], query_with_agent)
+
+        result = await pipeline.process_query("A, B and C")
+
+        assert max_in_flight == 3
+        assert [c.channel for c in result.channels] == [
+            "A:X",
+            "SR:DCCT:Current",
+            "B:X",
+            "C:X",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_error_is_reraised(self, sample_middle_layer_pipeline) -> None:
+        """Test that rate limit errors propagate while other errors are skipped."""
+
+        async def query_with_agent(query):
+            if query == "B":
+                raise RuntimeError("Error code: 429 - rate limit exceeded")
+            return {"channels": ["SR:DCCT:Current"], "description": query}
+
+        pipeline = sample_middle_layer_pipeline
+        self._prepare(pipeline, ["A", "B"], query_with_agent)
+
+        with pytest.raises(RuntimeError, match="429"):
+            await pipeline.process_query("A and B")
+
+    @pytest.mark.asyncio
+    async def test_failed_sub_query_is_skipped(self, sample_middle_layer_pipeline) -> None:
+        """Test that a non-rate-limit failure drops only that sub-query."""
+
+        async def query_with_agent(query):
+            if query == "A":
+                raise ValueError("boom")
+            return {"channels": ["SR:DCCT:Current"], "description": query}
+
+        pipeline = sample_middle_layer_pipeline
+        self._prepare(pipeline, ["A", "B"], query_with_agent)
+
+        result = await pipeline.process_query("A and B")
+
+        assert result.total_channels == 1
+
+    @pytest.mark.asyncio
+    async def test_blank_query_short_circuits(self, sample_middle_layer_pipeline) -> None:
+        """Test that whitespace-only queries return before any LLM stage runs."""
+
+        async def fail(query):
+            raise AssertionError("no stage should run for a blank query")
+
+        pipeline = sample_middle_layer_pipeline
+        pipeline._detect_explicit_channels = fail
+
+        result = await pipeline.process_query("   ")
+
+        assert result.total_channels == 0
+        assert result.processing_notes == "Empty query provided"
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_uses_cache(self, sample_middle_layer_pipeline) -> None:
+        """Test that agent results are reused for equivalent queries unless disabled."""
+        calls = []
+
+        async def query_with_agent(query):
+            calls.append(query)
+            return {"channels": ["SR:DCCT:Current"], "description": query}
+
+        pipeline = sample_middle_layer_pipeline
+        self._prepare(pipeline, ["beam current"], query_with_agent)
+
+        await pipeline.process_query("beam current")
+        result = await pipeline.process_query("  Beam   Current ")
+        assert len(calls) == 1
+        assert result.total_channels == 1
+
+        await pipeline.process_query("beam current", use_cache=False)
+        assert len(calls) == 2
+
+        pipeline.clear_query_cache()
+        await pipeline.process_query("beam current")
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_database_reload_invalidates_query_cache(
+        self, sample_middle_layer_pipeline
+    ) -> None:
+        """Test that cached agent results are not served after the database is reloaded."""
+        calls = []
+
+        async def query_with_agent(query):
+            calls.append(query)
+            return {"channels": ["SR:DCCT:Current"], "description": query}
+
+        pipeline = sample_middle_layer_pipeline
+        self._prepare(pipeline, ["beam current"], query_with_agent)
+
+        await pipeline.process_query("beam current")
+        await pipeline.process_query("beam current")
+        assert len(calls) == 1
+
+        pipeline.database.load_database()
+        await pipeline.process_query("beam current")
+        assert len(calls) == 2
+
+
+class TestMiddleLayerPromptDump:
+    """Test the debug prompt writer."""
+
+    def test_text_prompt_has_header(self, tmp_path) -> None:
+        """Test the default text format keeps the stage/query header."""
+        from osprey.services.channel_finder.pipelines.middle_layer.pipeline import (
+            _write_prompt_file,
+        )
+
+        filepath = tmp_path / "prompt.txt"
+        _write_prompt_file(filepath, "PROMPT BODY", "query_split", "beam current")
+
+        content = filepath.read_text(encoding="utf-8")
+        assert content.startswith("=== STAGE: QUERY_SPLIT ===\n")
+        assert "=== QUERY: beam current ===\n" in content
+        assert content.endswith("\n\nPROMPT BODY")
+
+    def test_json_prompt_record(self, tmp_path) -> None:
+        """Test the JSON format writes a single structured record."""
+        from osprey.services.channel_finder.pipelines.middle_layer.pipeline import (
+            _write_prompt_file,
+        )
+
+        filepath = tmp_path / "prompt.json"
+        _write_prompt_file(filepath, "PROMPT BODY", "query_split", "beam current", as_json=True)
+
+        record = json.loads(filepath.read_text(encoding="utf-8"))
+        assert record["stage"] == "query_split"
+        assert record["query"] == "beam current"
+        assert record["prompt"] == "PROMPT BODY"
+        assert "timestamp" in record
+
+    def test_missing_prompts_dir_is_recreated(self, tmp_path) -> None:
+        """Test a prompt dump directory removed at runtime is created again on write."""
+        from osprey.services.channel_finder.pipelines.middle_layer.pipeline import (
+            _write_prompt_file,
+        )
+
+        filepath = tmp_path / "temp_prompts" / "prompt.txt"
+        _write_prompt_file(filepath, "FIRST", "query_split", "")
+        filepath.unlink()
+        filepath.parent.rmdir()
+
+        _write_prompt_file(filepath, "SECOND", "query_split", "")
+
+        assert filepath.read_text(encoding="utf-8").endswith("\n\nSECOND")
+
+
 # === Fixtures ===
 
 
@@ -0,0 +1,72 @@
+"""Tests for code extraction helpers used by the Claude Code generator.
+
+These run without the Claude Agent SDK installed.
+"""
+
+from osprey.services.python_executor.generation.code_extraction import (
+    clean_generated_code,
+    extract_code_from_text,
+    looks_like_python_code,
+)
+
+
+class TestExtractCodeFromText:
+    """Test extraction of code blocks from model responses."""
+
+    def test_returns_last_python_block(self):
+        """Test the last python block wins when a response revises its code."""
+        text = "```python\nresults = {'draft': 1}\n```\nFixed:\n```python\nresults = {}\n```"
+        assert extract_code_from_text(text) == "results = {}"
+
+    def test_fence_casing_is_ignored(self):
+        """Test python fences are matched case-insensitively."""
+        text = "```Python\nimport sys\nresults = {}\n```"
+        assert extract_code_from_text(text) == "import sys\nresults = {}"
+
+    def test_later_mixed_case_block_wins(self):
+        """Test a later ```Python/```PYTHON block beats an earlier lowercase one."""
+        text = (
+            "```python\nresults = {'draft': 1}\n```\n"
+            "Fixed:\n```Python\nresults = {'v': 2}\n```\n"
+            "Final:\n```PYTHON\nresults = {'v': 3}\n```"
+        )
+        assert extract_code_from_text(text) == "results = {'v': 3}"
+
+    def test_unclosed_trailing_fence_falls_back_to_closed_block(self):
+        """Test a truncated trailing fence falls back to the last complete block."""
+        text = "```python\nimport sys\n```\nAnd then:\n```python\nresults = {"
+        assert extract_code_from_text(text) == "import sys"
+
+    def test_generic_block_requires_python_keywords(self):
+        """Test generic fences are only used when they contain Python keywords."""
+        assert extract_code_from_text("```\nsome output\n```") is None
+        assert extract_code_from_text("```\ndef f():\n    pass\n```") == "def f():\n    pass"
+
+    def test_no_fences_returns_none(self):
+        """Test unfenced text is not extracted."""
+        assert extract_code_from_text("import numpy as np\nresults = {}") is None
+
+
+class TestLooksLikePythonCode:
+    """Test detection of raw, unfenced Python code."""
+
+    def test_requires_two_indicators(self):
+        """Test at least two Python indicators are needed."""
+        assert looks_like_python_code("import numpy as np\nresults = {}")
+        assert not looks_like_python_code("results = 42")
+
+    def test_fenced_text_is_left_to_extraction(self):
+        """Test fenced text is not treated as raw code."""
+        assert not looks_like_python_code("```python\nimport sys\nresults = {}\n```")
+
+
+class TestCleanGeneratedCode:
+    """Test removal of markdown wrappers."""
+
+    def test_strips_markdown_wrapper(self):
+        """Test a python markdown wrapper is removed."""
+        assert clean_generated_code("```python\nimport sys\n```") == "import sys"
+
+    def test_preserves_clean_code(self):
+        """Test clean code only has surrounding whitespace stripped."""
+        assert clean_generated_code("  import sys\n") == "import sys"
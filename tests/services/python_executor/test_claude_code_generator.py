@@ -138,6 +138,19 @@ class TestClaudeCodeGeneratorPrompts:
         assert "executable" in prompt_lower and "python" in prompt_lower and "code" in prompt_lower
         assert "results" in prompt_lower
 
+    def test_result_schema_uses_stdlib_json(self):
+        """Test the plan's result schema renders exactly as json.dumps(indent=2)."""
+        import json
+        from types import SimpleNamespace
+
+        generator = ClaudeCodeGenerator()
+        schema = {"unit": "µA", "tolerance": float("nan"), "value": "<float>"}
+        plan = SimpleNamespace(domain_guidance=None, phases=None, result_schema=schema)
+
+        sections = generator._format_structured_plan(plan)
+
+        assert f"results = {json.dumps(schema, indent=2)}" in sections
+
 
 class TestClaudeCodeGeneratorSafety:
     """Test safety features of Claude Code generator."""
@@ -733,3 +746,237 @@ CONTROL SYSTEM OPERATIONS:
         assert isinstance(ClaudeCodeGenerator.DEFAULT_SYSTEM_PROMPT, str)
         assert len(ClaudeCodeGenerator.DEFAULT_SYSTEM_PROMPT) > 100  # Non-trivial content
         assert "Python" in ClaudeCodeGenerator.DEFAULT_SYSTEM_PROMPT
+
+
+class TestClaudeCodeGeneratorHistorySerialization:
+    """Test conversation history serialization of SDK messages."""
+
+    def test_assistant_blocks_serialized_in_order(self):
+        """Verify each supported block type is serialized and unknown blocks are skipped."""
+        from claude_agent_sdk import AssistantMessage, TextBlock, ThinkingBlock, ToolUseBlock
+
+        generator = ClaudeCodeGenerator()
+        message = AssistantMessage(
+            content=[
+                ThinkingBlock(thinking="Consider numpy", signature="sig"),
+                TextBlock(text="Here is the code"),
+                ToolUseBlock(id="tool_1", name="Read", input={"path": "example.py"}),
+            ],
+            model="claude-haiku-4-5-20251001",
+        )
+
+        result = generator._serialize_message_for_history(message)
+
+        assert result["role"] == "assistant"
+        assert isinstance(result["timestamp"], str)
+        assert [block["type"] for block in result["content"]] == ["thinking", "text", "tool_use"]
+        assert result["content"][2] == {
+            "type": "tool_use",
+            "id": "tool_1",
+            "name": "Read",
+            "input": {"path": "example.py"},
+        }
+
+    def test_serialization_reuses_provided_dict(self):
+        """Verify a supplied entry dict is cleared and refilled rather than replaced."""
+        from claude_agent_sdk import AssistantMessage, SystemMessage, TextBlock
+
+        generator = ClaudeCodeGenerator()
+        entry = {}
+
+        assistant = AssistantMessage(content=[TextBlock(text="hi")], model="test-model")
+        result = generator._serialize_message_for_history(assistant, out=entry)
+        assert result is entry
+        assert entry["role"] == "assistant"
+
+        system = SystemMessage(subtype="init", data={})
+        result = generator._serialize_message_for_history(system, out=entry)
+        assert result is entry
+        assert entry == {
+            "type": "SystemMessage",
+            "timestamp": entry["timestamp"],
+            "role": "system",
+            "subtype": "init",
+            "data": {},
+        }
+
+    def test_thinking_entry_content_is_capped(self):
+        """Verify retained thinking content is bounded while the full length is recorded."""
+        from claude_agent_sdk import ThinkingBlock
+
+        generator = ClaudeCodeGenerator(model_config={"max_retained_thinking_chars": 10})
+
+        entry = generator._thinking_entry(ThinkingBlock(thinking="x" * 25, signature="sig"))
+        assert entry["content"] == "x" * 10
+        assert entry["content_truncated"] is True
+        assert entry["length"] == 25
+
+        entry = generator._thinking_entry(ThinkingBlock(thinking="short", signature="sig"))
+        assert entry["content"] == "short"
+        assert entry["content_truncated"] is False
+
+    @pytest.mark.asyncio
+    async def test_history_streamed_to_valid_json_file(self, tmp_path):
+        """Verify incrementally written history is a complete JSON array once closed."""
+        import json
+
+        generator = ClaudeCodeGenerator(model_config={"save_prompts": True})
+        generator._execution_folder = tmp_path
+        generator._history_enabled = True
+
+        await generator._write_history_entry({"type": "SystemMessage", "role": "system"})
+        await generator._write_history_entry({"type": "ResultMessage", "role": "result"})
+        await generator._close_history_file()
+
+        history = json.loads((tmp_path / "prompts" / "conversation_full.json").read_text())
+        assert [entry["role"] for entry in history] == ["system", "result"]
+        assert generator._history_count == 2
+
+    @pytest.mark.asyncio
+    async def test_history_entries_coalesced_until_flush(self, tmp_path, monkeypatch):
+        """Verify buffered history entries are written together on close."""
+        import json
+
+        from osprey.services.python_executor.generation import claude_code_generator
+
+        monkeypatch.setattr(claude_code_generator, "_HISTORY_FLUSH_INTERVAL_S", float("inf"))
+        generator = ClaudeCodeGenerator(model_config={"save_prompts": True})
+        generator._execution_folder = tmp_path
+        generator._history_enabled = True
+
+        for role in ("system", "assistant", "result"):
+            await generator._write_history_entry({"role": role})
+
+        history_path = tmp_path / "prompts" / "conversation_full.json"
+        assert not history_path.exists()
+        assert len(generator._history_pending) == 3
+
+        await generator._close_history_file()
+
+        history = json.loads(history_path.read_text())
+        assert [entry["role"] for entry in history] == ["system", "assistant", "result"]
+
+    @pytest.mark.asyncio
+    async def test_response_messages_stamped_on_receipt(self, monkeypatch):
+        """Verify each message collected from one response gets its own receive time."""
+        import datetime
+        from types import SimpleNamespace
+
+        from claude_agent_sdk import SystemMessage
+
+        from osprey.services.python_executor.generation import claude_code_generator
+
+        ticks = iter(range(10))
+
+        class _Clock:
+            @staticmethod
+            def now():
+                return datetime.datetime(2025, 1, 1, 0, 0, next(ticks))
+
+        monkeypatch.setattr(claude_code_generator, "datetime", SimpleNamespace(datetime=_Clock))
+        generator = ClaudeCodeGenerator()
+        generator._history_enabled = True
+        written = []
+
+        async def record(entry):
+            # The entry dict is reused between messages, so keep a copy
+            written.append(dict(entry))
+
+        monkeypatch.setattr(generator, "_write_history_entry", record)
+
+        class _FakeClient:
+            async def receive_response(self):
+                for subtype in ("init", "status", "status"):
+                    yield SystemMessage(subtype=subtype, data={})
+
+        await generator._collect_response(_FakeClient(), "generate")
+
+        assert [entry["subtype"] for entry in written] == ["init", "status", "status"]
+        assert [entry["timestamp"] for entry in written] == [
+            "2025-01-01T00:00:00",
+            "2025-01-01T00:00:01",
+            "2025-01-01T00:00:02",
+        ]
+
+
+class TestClaudeCodeGeneratorStreaming:
+    """Test block-level stream events."""
+
+    @staticmethod
+    async def _stream_events(generator, content):
+        """Collect one assistant message with the given blocks and return the stream writes."""
+        from claude_agent_sdk import AssistantMessage
+
+        emitted = []
+        generator._stream_writer = emitted.append
+
+        class _FakeClient:
+            async def receive_response(self):
+                yield AssistantMessage(content=content, model="test-model")
+
+        await generator._collect_response(_FakeClient(), "generate")
+        return emitted
+
+    @pytest.mark.asyncio
+    async def test_single_block_streams_one_event(self):
+        """Verify a single block is streamed as exactly one per-block event."""
+        from claude_agent_sdk import TextBlock
+
+        emitted = await self._stream_events(ClaudeCodeGenerator(), [TextBlock(text="hello")])
+
+        assert emitted == [
+            {
+                "type": "claude_code",
+                "event": "text",
+                "phase": "generate",
+                "content": "hello",
+                "length": 5,
+            }
+        ]
+
+    @pytest.mark.asyncio
+    async def test_multiple_blocks_stream_one_event_each(self):
+        """Verify several blocks keep the per-block event shape, in order, with no wrapper."""
+        from claude_agent_sdk import TextBlock, ToolUseBlock
+
+        emitted = await self._stream_events(
+            ClaudeCodeGenerator(),
+            [
+                TextBlock(text="hello"),
+                ToolUseBlock(id="tool_1", name="Read", input={"path": "a.py"}),
+            ],
+        )
+
+        assert emitted == [
+            {
+                "type": "claude_code",
+                "event": "text",
+                "phase": "generate",
+                "content": "hello",
+                "length": 5,
+            },
+            {
+                "type": "claude_code",
+                "event": "tool_use",
+                "phase": "generate",
+                "tool": "Read",
+                "input": {"path": "a.py"},
+            },
+        ]
+
+    def test_tool_input_log_format(self):
+        """Verify tool inputs are summarized by the first matching key, else generically."""
+        generator = ClaudeCodeGenerator()
+
+        assert (
+            generator._format_tool_input_for_log({"target_file": "a.py", "pattern": "def x"})
+            == "searching 'def x' in a.py"
+        )
+        assert (
+            generator._format_tool_input_for_log({"glob_pattern": "*.py", "path": "src"})
+            == "finding files matching '*.py'"
+        )
+        assert (
+            generator._format_tool_input_for_log({"a": "1", "b": 2, "c": "3", "d": 4})
+            == "a=1, b=2, c=3"
+        )
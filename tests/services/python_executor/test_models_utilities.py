@@ -259,6 +259,16 @@ class TestExecutionError:
         assert "Risky operation detected" in text
         assert "Traceback:" in text
 
+    def test_to_prompt_text_reflects_field_updates(self):
+        """Test prompt text follows changes made after a first render."""
+        error = ExecutionError(
+            error_type="execution", error_message="Division by zero", stage="execution"
+        )
+        error.to_prompt_text()
+        error.attempt_number = 2
+
+        assert "**Attempt 2 - EXECUTION FAILED**" in error.to_prompt_text()
+
 
 class TestNotebookType:
     """Tests for NotebookType enum."""